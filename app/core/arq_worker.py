@@ -1,23 +1,50 @@
 from arq.connections import RedisSettings
 
 from app.core.config import settings
-from app.modules.notifications.async_tasks.tasks.base_tasks import send_email_task
+from app.core.logger import logger
+from app.core.metrics import instrument_job, start_metrics_server, stop_metrics
+from app.core.smtp import create_smtp_pool
+from app.modules.notifications.async_tasks.tasks.base_tasks import (
+    send_email_batch_task,
+    send_email_task,
+    send_template_email_task,
+    send_workspace_invitation_emails_task,
+)
+from app.modules.notifications.async_tasks.tasks.export_tasks import export_messages_task
 from app.modules.notifications.async_tasks.tasks.realtime_tasks import send_unread_message
+from app.modules.notifications.async_tasks.utils import precompile_email_templates
 
 REDIS_SETTINGS = RedisSettings(host=settings.REDIS_HOST, port=settings.REDIS_PORT, database=settings.REDIS_ARQ_DB)
 
 
 async def startup(ctx):
-    print("Arq worker starting up")
-    print(f"Using Redis DB: {ctx['redis']}")
+    logger.info("Arq worker starting up, using Redis DB: {redis}", redis=ctx["redis"])
+    ctx["smtp"] = create_smtp_pool()
+    precompile_email_templates()
+    if settings.METRICS_ENABLED:
+        # The worker runs in its own process, its job metrics are scraped from a separate port
+        start_metrics_server(settings.ARQ_METRICS_PORT)
 
 
 async def shutdown(ctx):
-    print("Arq worker shutting down")
+    logger.info("Arq worker shutting down")
+    await ctx["smtp"].close()
+    if settings.METRICS_ENABLED:
+        stop_metrics()
 
 
 class WorkerSettings:
-    functions = [send_email_task, send_unread_message]
+    functions = [
+        instrument_job(task)
+        for task in (
+            send_email_task,
+            send_email_batch_task,
+            send_template_email_task,
+            send_workspace_invitation_emails_task,
+            send_unread_message,
+            export_messages_task,
+        )
+    ]
     on_startup = startup
     on_shutdown = shutdown
     redis_settings = REDIS_SETTINGS
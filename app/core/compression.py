@@ -0,0 +1,173 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: uv sync --extra compression
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: uv sync --extra compression
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/x-ndjson")
+# Bigger bodies are compressed in a worker thread instead of blocking the event loop
+THREAD_OFFLOAD_SIZE = 256 * 1024
+
+
+def _encoders(gzip_level: int, brotli_quality: int, zstd_level: int) -> dict[str, Callable[[bytes], bytes]]:
+    # Preference order when the client accepts several
+    encoders = {}
+    if zstandard is not None:
+        # A ZstdCompressor must not be used by two threads at once and big bodies are compressed in worker
+        # threads: each thread gets its own
+        local = threading.local()
+
+        def zstd_compress(body: bytes) -> bytes:
+            compressor = getattr(local, "compressor", None)
+            if compressor is None:
+                compressor = local.compressor = zstandard.ZstdCompressor(level=zstd_level)
+            return compressor.compress(body)
+
+        encoders["zstd"] = zstd_compress
+    if brotli is not None:
+        encoders["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+    encoders["gzip"] = lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    return encoders
+
+
+class CompressedCache:
+    """LRU of compressed bodies keyed by (digest of the plain body, encoding), bounded in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+
+    def get(self, key: tuple[bytes, str]) -> bytes | None:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: tuple[bytes, str], body: bytes):
+        if len(body) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """Compress complete responses with zstd, brotli or gzip, whichever the client accepts first in that order.
+
+    Skipped for streamed bodies, bodies below `minimum_size`, non-text content and responses that
+    already carry a Content-Encoding. Responses with an ETag (revalidatable, so likely requested again
+    by other clients or polls) have their compressed bytes cached: the same payload is compressed once.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache_max_bytes: int = 32 * 1024 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = _encoders(gzip_level, brotli_quality, zstd_level)
+        self.cache = CompressedCache(cache_max_bytes) if cache_max_bytes else None
+
+    def _negotiate(self, accept_encoding: str) -> str | None:
+        accepted = set()
+        for part in accept_encoding.split(","):
+            coding, _, params = part.partition(";")
+            name, _, value = params.strip().partition("=")
+            try:
+                if name.strip() == "q" and float(value) == 0:
+                    continue  # explicitly refused
+            except ValueError:
+                continue
+            accepted.add(coding.strip().lower())
+        return next((encoding for encoding in self.encoders if encoding in accepted), None)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            # Streamed responses are sent as they come, they are not buffered to be compressed
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            compressed = await self._compress(body, encoding, cacheable="etag" in headers)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _compress(self, body: bytes, encoding: str, cacheable: bool) -> bytes:
+        encode = self.encoders[encoding]
+        if not cacheable or self.cache is None:
+            return await self._run(encode, body)
+
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = await self._run(encode, body)
+            self.cache.put(key, compressed)
+        return compressed
+
+    @staticmethod
+    async def _run(encode: Callable[[bytes], bytes], body: bytes) -> bytes:
+        if len(body) >= THREAD_OFFLOAD_SIZE:
+            return await to_thread.run_sync(encode, body)
+        return encode(body)
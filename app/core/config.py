@@ -32,6 +32,55 @@ class Config(BaseSettings):
     REFRESH_SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 2  # 15 mins
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 2  # 2 days
+    MAX_DEVICES: int = 3  # concurrent sessions per user, the oldest is signed out beyond it
+
+    # Logging settings
+    LOG_LEVEL: str = "INFO"
+    LOG_REQUEST_SAMPLE_RATE: float = 1.0
+    LOG_ROUTE_SAMPLE_RATES: dict[str, float] = {}  # e.g. {"GET /api/v1/workspaces/{workspace_id}": 0.1}
+
+    # Metrics settings
+    # Served on internal ports only, never through the API. Keep them off the public network
+    METRICS_ENABLED: bool = False
+    METRICS_PORT: int = 9190
+    ARQ_METRICS_PORT: int = 9191
+    ARQ_QUEUE_DEPTH_INTERVAL: float = 15.0  # seconds between refreshes of the queue depth gauge
+    # Query budget: per-request statement counts in X-DB-* response headers, warnings on N+1 patterns.
+    # Opt-in, the headers describe the database work behind every response
+    QUERY_DEBUG: bool = False
+    QUERY_BUDGET: int = 30
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Response compression: zstd / brotli are used when their packages are installed
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes, smaller bodies are sent as is
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # compressed ETag-tagged bodies, 0 disables the cache
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Overload protection: token buckets in Redis keyed by user id, or client IP when unauthenticated
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: dict[str, tuple[int, float]] = {  # route -> (burst capacity, tokens refilled per second)
+        "login": (10, 10 / 60),
+        "forgot_password": (3, 3 / 3600),
+        "create_message": (30, 5),
+        "create_reaction": (30, 5),
+        "upload_file": (10, 0.5),
+    }
+    # Requests needing a DB connection get a 503 while the pool is exhausted and the moving average of
+    # checkout waits is above this many seconds, instead of queueing up to POOL_TIMEOUT. 0 disables
+    LOAD_SHED_CHECKOUT_WAIT: float = 0.5
+    LOAD_SHED_RETRY_AFTER: int = 1  # seconds, sent as Retry-After
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 3600  # how long responses are replayed for a retried Idempotency-Key
+
+    # Realtime settings
+    TYPING_THROTTLE_MS: int = 3000  # at most one typing broadcast per (user, channel) in this window
+    # message:create carries ids plus a compact delta, clients resolve senders through users:sync.
+    # Off by default: it changes the payload, enable it once every client handles deltas
+    REALTIME_MESSAGE_DELTAS: bool = False
+    SOCKET_IO_SHARDS: int = 64  # pub/sub channels room emits are hashed over, 1 disables sharding
+    # "msgpack" needs the msgpack extra and clients using socket.io-msgpack-parser
+    SOCKET_IO_SERIALIZER: Literal["json", "msgpack"] = "json"
 
     # Database settings
     DATABASE_URL: PostgresDsn
@@ -57,6 +106,10 @@ class Config(BaseSettings):
     SMTP_TLS: bool = True
     SMTP_USER: str
     SMTP_PASSWORD: str
+    SMTP_POOL_SIZE: int = 4  # persistent connections per ARQ worker
+    SMTP_RATE_LIMIT: float = 0  # messages per second per worker, 0 disables
+    SMTP_MAX_RETRIES: int = 3
+    SMTP_RETRY_BACKOFF: float = 1.0  # seconds, doubled on each retry
 
     # AWS settings
     AWS_S3_BUCKET_NAME: str
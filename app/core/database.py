@@ -1,16 +1,28 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     create_async_engine,
 )
 
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKED_OUT
+from app.core.query_budget import record_query
+
+POOL_MAX_OVERFLOW = settings.MAX_CONNECTIONS - settings.MIN_CONNECTIONS
 
 async_engine: AsyncEngine = create_async_engine(
     str(settings.DATABASE_URL),
     pool_size=settings.MAX_CONNECTIONS,
-    max_overflow=settings.MAX_CONNECTIONS - settings.MIN_CONNECTIONS,
+    max_overflow=POOL_MAX_OVERFLOW,
     pool_pre_ping=settings.POOL_PRE_PING,
     pool_recycle=settings.POOL_RECYCLE,
     pool_timeout=settings.POOL_TIMEOUT,
     echo=settings.ECHO,
 )
+
+DB_POOL_CHECKED_OUT.set_function(lambda: async_engine.pool.checkedout())
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    record_query(statement)
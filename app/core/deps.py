@@ -1,3 +1,4 @@
+import time
 from typing import Annotated, AsyncGenerator
 
 from arq.connections import ArqRedis
@@ -5,12 +6,26 @@ from fastapi import Depends, Request
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from app.core.database import async_engine
+from app.core.config import settings
+from app.core.database import POOL_MAX_OVERFLOW, async_engine
+from app.core.load_shedding import PoolLoadShedder
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT
 from app.core.redis import redis_client
 
+pool_load_shedder = PoolLoadShedder(
+    threshold=settings.LOAD_SHED_CHECKOUT_WAIT,
+    capacity=settings.MAX_CONNECTIONS + POOL_MAX_OVERFLOW,
+    checked_out=lambda: async_engine.pool.checkedout(),
+)
+
 
 async def get_connection() -> AsyncGenerator[AsyncConnection, None]:
+    pool_load_shedder.check()
+    started_at = time.perf_counter()
     async with async_engine.connect() as conn:
+        waited = time.perf_counter() - started_at
+        DB_POOL_CHECKOUT_WAIT.observe(waited)
+        pool_load_shedder.observe(waited)
         async with conn.begin():
             yield conn
 
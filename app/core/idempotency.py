@@ -0,0 +1,170 @@
+import hashlib
+import json
+
+from fastapi import HTTPException, Request, Response, status
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.datastructures import UploadFile
+
+from app.core.config import settings
+from app.core.deps import RedisDep
+from app.core.rate_limit import client_key
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+# How long a key stays claimed by a request still being processed, a crashed worker frees it after this
+PENDING_TTL = 60
+
+
+class IdempotencyKeyInUse(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+            headers={"Retry-After": "1"},
+        )
+
+
+class IdempotencyKeyMismatch(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request",
+        )
+
+
+class InvalidIdempotencyKey(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Idempotency-Key")
+
+
+class IdempotentReplay(Exception):
+    """Raised by the dependency to short-circuit the route with the stored response, see main.py."""
+
+    def __init__(self, stored: dict):
+        self.stored = stored
+
+    def to_response(self) -> Response:
+        response = Response(
+            content=self.stored["body"],
+            status_code=self.stored["status_code"],
+            media_type=self.stored["media_type"],
+        )
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+
+class IdempotencyKey:
+    """Claim on an Idempotency-Key for the current request. Inactive when the client sent none."""
+
+    def __init__(self, redis: Redis | None = None, key: str | None = None, fingerprint: str | None = None):
+        self.redis = redis
+        self.key = key
+        self.fingerprint = fingerprint
+        self.response: Response | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.key is not None
+
+    def save(self, response: Response) -> Response:
+        """Mark a successful response to be replayed to retries of this request.
+
+        It is only stored once the request's transaction has committed, see Idempotency.
+        """
+        self.response = response
+        return response
+
+    async def store(self):
+        stored = {
+            "state": "done",
+            "fingerprint": self.fingerprint,
+            "status_code": self.response.status_code,
+            "media_type": self.response.media_type,
+            "body": self.response.body.decode(),
+        }
+        try:
+            await self.redis.set(self.key, json.dumps(stored), ex=settings.IDEMPOTENCY_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning("Could not store idempotent response {key}: {error}", key=self.key, error=e)
+
+    async def release(self):
+        # The request failed: a retry with the same key must be processed again
+        try:
+            await self.redis.delete(self.key)
+        except RedisError as e:
+            logger.warning("Could not release idempotency key {key}: {error}", key=self.key, error=e)
+
+
+class Idempotency:
+    """Route dependency making a POST safe to retry with an Idempotency-Key header.
+
+    The first request claims the key (SET NX GET, one round trip) and the route marks its response with
+    `idempotency.save(response)`. A retry with the same key, by the same user or client IP, gets that
+    response back without running the route; one still in flight gets a 409. Keys are scoped per route and
+    expire after settings.IDEMPOTENCY_TTL_SECONDS. Declare it before the route's database dependencies: a
+    replay then costs no connection, and as dependencies are closed in reverse order the response is only
+    stored after get_connection has committed. A failed commit releases the key instead:
+
+        async def create_message(idempotency: Annotated[IdempotencyKey, Depends(Idempotency("create_message"))], ...)
+    """
+
+    def __init__(self, scope: str):
+        self.scope = scope
+
+    async def __call__(self, request: Request, redis: RedisDep):
+        header = request.headers.get(IDEMPOTENCY_HEADER)
+        if not header:
+            yield IdempotencyKey()
+            return
+        if len(header) > MAX_KEY_LENGTH:
+            raise InvalidIdempotencyKey()
+
+        key = f"idempotency:{self.scope}:{client_key(request)}:{header}"
+        fingerprint = await _fingerprint(request)
+        try:
+            previous = await redis.set(
+                key, json.dumps({"state": "pending", "fingerprint": fingerprint}), ex=PENDING_TTL, nx=True, get=True
+            )
+        except RedisError as e:
+            # Fail open, as the rate limiter does: the request runs without replay protection
+            logger.warning("Idempotency check failed for {scope}: {error}", scope=self.scope, error=e)
+            yield IdempotencyKey()
+            return
+
+        if previous is not None:
+            stored = json.loads(previous)
+            if stored["fingerprint"] != fingerprint:
+                raise IdempotencyKeyMismatch()
+            if stored["state"] == "pending":
+                raise IdempotencyKeyInUse()
+            raise IdempotentReplay(stored)
+
+        idempotency_key = IdempotencyKey(redis=redis, key=key, fingerprint=fingerprint)
+        try:
+            yield idempotency_key
+        except Exception:
+            await idempotency_key.release()
+            raise
+        if idempotency_key.response is None:
+            await idempotency_key.release()
+        else:
+            await idempotency_key.store()
+
+
+async def _fingerprint(request: Request) -> str:
+    digest = hashlib.blake2b(f"{request.method} {request.url.path}".encode(), digest_size=16)
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        # Small, and already read for validation
+        digest.update(await request.body())
+    elif content_type.startswith("multipart/form-data"):
+        # FastAPI has already parsed the form and request.form() returns it from cache. Files are described by
+        # name and size rather than read and hashed a second time
+        form = await request.form()
+        for name, value in form.multi_items():
+            if isinstance(value, UploadFile):
+                value = f"{value.filename}:{value.size}"
+            digest.update(f"\0{name}={value}".encode())
+    return digest.hexdigest()
@@ -0,0 +1,41 @@
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.metrics import DB_LOAD_SHED
+
+# Weight of the newest checkout wait in the moving average
+CHECKOUT_WAIT_SMOOTHING = 0.2
+
+
+class ServiceOverloaded(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is overloaded, retry shortly",
+            headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER)},
+        )
+
+
+class PoolLoadShedder:
+    """Turn away requests that would queue for a pooled connection while the pool is overloaded.
+
+    Overloaded means every connection is checked out and the moving average of recent checkout waits is
+    above `threshold`. Shedding starts and stops on its own: requests let through while connections are
+    free record short waits, which pull the average back under the threshold.
+    """
+
+    def __init__(self, threshold: float, capacity: int, checked_out):
+        self.threshold = threshold
+        self.capacity = capacity
+        self._checked_out = checked_out
+        self.average_wait = 0.0
+
+    def observe(self, wait: float):
+        self.average_wait += CHECKOUT_WAIT_SMOOTHING * (wait - self.average_wait)
+
+    def check(self):
+        if self.threshold <= 0 or self.average_wait <= self.threshold:
+            return
+        if self._checked_out() >= self.capacity:
+            DB_LOAD_SHED.inc()
+            raise ServiceOverloaded()
@@ -1,17 +1,24 @@
+import random
 import sys
 from pathlib import Path
 
 from loguru import logger
 
+from app.core.config import settings
+
 log_path = Path("logs/app.log")
 log_path.parent.mkdir(exist_ok=True)
 
 logger.remove()
 
+# Both sinks are queue-backed: formatting and I/O happen on loguru's writer thread, not on the event loop.
+# Calls below the configured level return before any formatting, so pass values as arguments
+# (logger.debug("... {room}", room=room)) instead of f-strings, and use opt(lazy=True) for costly values.
 logger.add(
     sys.stdout,
-    level="INFO",
+    level=settings.LOG_LEVEL,
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level}</level> | {message}",
+    enqueue=True,
 )
 
 logger.add(
@@ -24,4 +31,11 @@ logger.add(
     enqueue=True,
     backtrace=True,
     diagnose=True,
+    serialize=True,  # one JSON record per line, keyword arguments end up in "extra"
 )
+
+
+def should_sample(route: str) -> bool:
+    """Decide whether to log a request of the given route template, rates come from the settings."""
+    rate = settings.LOG_ROUTE_SAMPLE_RATES.get(route, settings.LOG_REQUEST_SAMPLE_RATE)
+    return rate >= 1 or random.random() < rate
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import time
+from functools import wraps
+
+from loguru import logger
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess, start_http_server
+
+# Set when the API runs with several workers, or several ARQ workers run side by side: every process then records
+# its samples to files in this directory and the metrics server combines them
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# --- HTTP ---
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status_code"],
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+HTTP_RATE_LIMITED = Counter("http_rate_limited_requests_total", "Requests rejected with 429 by a rate limit", ["route"])
+
+# --- Database ---
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Database connections currently checked out", multiprocess_mode="livesum"
+)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed")
+DB_REPEATED_QUERY_SHAPES = Counter(
+    "db_repeated_query_shapes_total",
+    "Statement shapes executed at least N_PLUS_ONE_THRESHOLD times within one request",
+    ["method", "route"],
+)
+DB_LOAD_SHED = Counter(
+    "db_load_shed_requests_total", "Requests rejected with 503 while the connection pool was saturated"
+)
+
+# --- Redis ---
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+# --- Socket.IO (local to this node) ---
+SOCKETIO_CONNECTED = Gauge(
+    "socketio_connected_sockets", "Socket.IO sockets connected to this node", multiprocess_mode="livesum"
+)
+SOCKETIO_ROOMS = Gauge("socketio_rooms", "Socket.IO rooms with at least one local socket", multiprocess_mode="livesum")
+SOCKETIO_EMIT_FANOUT = Histogram(
+    "socketio_emit_fanout",
+    "Local sockets reached per room emit",
+    ["event_type"],
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+
+# --- ARQ ---
+# Every API worker polls the same queue, the latest reading is the depth
+ARQ_QUEUE_DEPTH = Gauge("arq_queue_depth", "Jobs waiting in the ARQ queue", multiprocess_mode="livemostrecent")
+ARQ_JOB_DURATION = Histogram(
+    "arq_job_duration_seconds",
+    "ARQ job duration",
+    ["function", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+
+
+def start_metrics_server(port: int):
+    """Serve metrics on an internal port.
+
+    In multiprocess mode the first process to bind the port serves the samples of all of them. The others, and a
+    single process whose port is taken, log it and start anyway: metrics are never worth failing a boot for.
+    """
+    registry = REGISTRY
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    try:
+        start_http_server(port, registry=registry)
+    except OSError as e:
+        logger.warning("Metrics server not started on port {port}: {error}", port=port, error=e)
+
+
+def stop_metrics():
+    """Drop this process's live gauges from the combined metrics when it exits."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def instrument_job(func):
+    """Record duration and outcome of an ARQ task, the wrapped name is kept so ARQ registers it unchanged."""
+
+    @wraps(func)
+    async def wrapper(ctx, *args, **kwargs):
+        started_at = time.perf_counter()
+        status = "success"
+        try:
+            return await func(ctx, *args, **kwargs)
+        except BaseException:
+            status = "failure"
+            raise
+        finally:
+            ARQ_JOB_DURATION.labels(function=func.__name__, status=status).observe(time.perf_counter() - started_at)
+
+    return wrapper
+
+
+async def track_queue_depth(arq_redis, queue_name: str, interval: float):
+    """Refresh ARQ_QUEUE_DEPTH every `interval` seconds.
+
+    The metrics port is served from a thread that cannot query Redis when scraped, so the gauge is kept current
+    from the event loop instead.
+    """
+    while True:
+        try:
+            ARQ_QUEUE_DEPTH.set(await arq_redis.zcard(queue_name))
+        except Exception as e:
+            logger.warning("Could not read the ARQ queue depth: {error}", error=e)
+        await asyncio.sleep(interval)
@@ -0,0 +1,52 @@
+import base64
+from enum import Enum
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException, status
+
+CURSOR_SEPARATOR = "\x1f"
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+class InvalidCursor(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def encode_cursor(*values: str) -> str:
+    """Opaque keyset cursor: the sort key of the last row of a page."""
+    return base64.urlsafe_b64encode(CURSOR_SEPARATOR.join(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> tuple[str, ...] | None:
+    if not cursor:
+        return None
+    try:
+        values = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(CURSOR_SEPARATOR)
+    except ValueError:
+        raise InvalidCursor()
+    if len(values) != size:
+        raise InvalidCursor()
+    return tuple(values)
+
+
+def decode_member_cursor(cursor: str | None, role_enum: type[Enum]) -> tuple[str, str] | None:
+    """Decode the (role, user_id) cursor of a member page.
+
+    The role is compared against a Postgres enum column, an unknown value would fail the query instead of the cursor.
+    """
+    after = decode_cursor(cursor, 2)
+    if after is not None and after[0] not in {role.value for role in role_enum}:
+        raise InvalidCursor()
+    return after
+
+
+def cursor_page(
+    rows: Sequence[Any], limit: int, total: int, key: Callable[[Any], tuple[str, ...]]
+) -> tuple[Sequence[Any], dict]:
+    """Trim rows fetched with `limit + 1` to a page, next_cursor points at its last row when more follow."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    pagination = {"next_cursor": encode_cursor(*key(rows[-1])) if has_more else None, "limit": limit, "total": total}
+    return rows, pagination
@@ -0,0 +1,16 @@
+"""Pytest helpers, loaded with `-p app.core.pytest_plugin` (see pyproject.toml)."""
+
+import pytest
+
+from app.core.query_budget import assert_max_queries
+
+
+@pytest.fixture
+def max_queries():
+    """Query budget for a block of code or a request.
+
+    async def test_get_channels(client, max_queries):
+        with max_queries(3, max_repeats=1):
+            response = await client.get(f"/api/v1/workspaces/{workspace_id}/channels")
+    """
+    return assert_max_queries
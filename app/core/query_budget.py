@@ -0,0 +1,65 @@
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from app.core.metrics import DB_QUERIES
+
+_BIND_PARAM = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?|%\(\w+\)s")
+_EXPANDED_LIST = re.compile(r"\?(?:, \?)+")
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    # Statement shape -> executions, only tracked when query debugging is on
+    shapes: Counter | None = None
+
+    def repeated_shapes(self, threshold: int) -> dict[str, int]:
+        if not self.shapes:
+            return {}
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+# Set by the request middleware, mutated by the engine event listeners running for that request
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape: bind parameters and expanded IN lists collapse to a single `?`."""
+    return _EXPANDED_LIST.sub("?", _BIND_PARAM.sub("?", " ".join(statement.split())))
+
+
+def record_query(statement: str) -> None:
+    DB_QUERIES.inc()
+    stats = request_stats.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    if stats.shapes is not None:
+        stats.shapes[normalize_statement(statement)] += 1
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, *, max_repeats: int | None = None) -> Iterator[RequestStats]:
+    """Fail when the wrapped block runs more than `max_queries` statements (or repeats one shape `max_repeats` times).
+
+    Requests served in the block (e.g. through httpx.ASGITransport) add to the same stats.
+    """
+    stats = RequestStats(shapes=Counter())
+    token = request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        request_stats.reset(token)
+
+    if stats.queries > max_queries:
+        raise QueryBudgetExceeded(f"{stats.queries} queries executed, budget is {max_queries}")
+    if max_repeats is not None and (repeated := stats.repeated_shapes(max_repeats + 1)):
+        raise QueryBudgetExceeded(f"Statements repeated more than {max_repeats} times: {repeated}")
@@ -0,0 +1,104 @@
+import math
+
+import jwt
+from fastapi import HTTPException, Request, status
+from jwt import InvalidTokenError
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.deps import RedisDep
+from app.core.metrics import HTTP_RATE_LIMITED
+
+# Refill and take in one step on the server so concurrent requests cannot both spend the last token.
+# Redis TIME is the clock, app nodes with skewed clocks share the same buckets.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+-- Once refilled to capacity the bucket is the same as a missing one
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RateLimitExceeded(HTTPException):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy, uvicorn's --proxy-headers sets the client from X-Forwarded-For
+    return request.client.host if request.client else "unknown"
+
+
+def client_key(request: Request) -> str:
+    """Bucket owner: the user of a valid access token cookie, else the client IP.
+
+    The token is only decoded here, the user is not loaded, so a rejected request never touches the database.
+    """
+    token = request.cookies.get("access_token")
+    if token:
+        try:
+            payload = jwt.decode(token, settings.ACCESS_SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except InvalidTokenError:
+            payload = {}
+        if payload.get("type") == "access_token" and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{client_ip(request)}"
+
+
+class RateLimit:
+    """Route dependency spending one token of the `route` bucket in settings.RATE_LIMITS.
+
+    Usage: @router.post(..., dependencies=[Depends(RateLimit("create_message"))])
+    Fails open: if Redis is unreachable the request goes through.
+    """
+
+    def __init__(self, route: str, cost: int = 1):
+        self.route = route
+        self.cost = cost
+        self._script = None
+
+    async def __call__(self, request: Request, redis: RedisDep):
+        limit = settings.RATE_LIMITS.get(self.route)
+        if not settings.RATE_LIMIT_ENABLED or not limit:
+            return
+
+        capacity, rate = limit
+        try:
+            retry_after = await self._take(redis, f"rate_limit:{self.route}:{client_key(request)}", capacity, rate)
+        except RedisError as e:
+            logger.warning("Rate limit check failed for {route}: {error}", route=self.route, error=e)
+            return
+
+        if retry_after > 0:
+            HTTP_RATE_LIMITED.labels(route=self.route).inc()
+            raise RateLimitExceeded(retry_after=math.ceil(retry_after))
+
+    async def _take(self, redis: Redis, key: str, capacity: int, rate: float) -> float:
+        if self._script is None:
+            # EVALSHA, the script is loaded again by redis-py on NOSCRIPT
+            self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+        return float(await self._script(keys=[key], args=[capacity, rate, self.cost], client=redis))
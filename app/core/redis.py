@@ -1,7 +1,40 @@
+import time
+
 from loguru import logger
 from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.client import Pipeline
 
 from app.core.config import settings
+from app.core.metrics import REDIS_COMMAND_DURATION
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline recording the latency of each round trip, as a MULTI or PIPELINE command.
+
+    Commands queued in a pipeline are sent together and have no latency of their own.
+    """
+
+    async def execute(self, raise_on_error: bool = True):
+        command = "MULTI" if self.is_transaction else "PIPELINE"
+        started_at = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_DURATION.labels(command=command).observe(time.perf_counter() - started_at)
+
+
+class InstrumentedRedis(Redis):
+    """Redis client recording the latency of every command and pipeline it executes."""
+
+    async def execute_command(self, *args, **options):
+        started_at = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels(command=str(args[0]).upper()).observe(time.perf_counter() - started_at)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
 
 
 class RedisClient:
@@ -23,7 +56,7 @@ class RedisClient:
 
     def get_client(self):
         if self._client is None:
-            self._client = Redis(connection_pool=self._pool)
+            self._client = InstrumentedRedis(connection_pool=self._pool)
         return self._client
 
     async def connect(self):
@@ -1,6 +1,15 @@
+import hashlib
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from types import UnionType
+from typing import Any, AsyncIterator, Callable, Union, get_args, get_origin
 from uuid import UUID
 
-from fastapi.responses import ORJSONResponse
+import orjson
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from starlette import status
 
@@ -42,6 +51,168 @@ def success_response(
     return ORJSONResponse(content=payload, status_code=status_code)
 
 
+# Fast path: rows are mapped onto the fields declared by a read schema once,
+# then the whole envelope is encoded by orjson in a single call.
+# Skips model_validate / model_dump / make_serializable for large list responses.
+def _nested_model(annotation: Any) -> tuple[type[BaseModel] | None, bool]:
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        for arg in get_args(annotation):
+            model, is_list = _nested_model(arg)
+            if model is not None:
+                return model, is_list
+        return None, False
+
+    if origin is list:
+        args = get_args(annotation)
+        model, _ = _nested_model(args[0]) if args else (None, False)
+        return model, model is not None
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+
+    return None, False
+
+
+def _as_mapping(obj: Any) -> Mapping:
+    if isinstance(obj, Mapping):
+        return obj
+    return obj._mapping
+
+
+@lru_cache
+def compile_serializer(schema: type[BaseModel]) -> Callable[[Any], dict]:
+    """Build a function mapping a dict / Row onto the fields of `schema`, recursing into nested schemas."""
+    fields = []
+    for name, field in schema.model_fields.items():
+        nested, is_list = _nested_model(field.annotation)
+        fields.append((name, compile_serializer(nested) if nested else None, is_list))
+    fields = tuple(fields)
+
+    def serialize(obj: Any) -> dict:
+        source = _as_mapping(obj)
+        result = {}
+        for name, nested_serializer, is_list in fields:
+            value = source.get(name)
+            if nested_serializer is not None and value is not None:
+                value = [nested_serializer(v) for v in value] if is_list else nested_serializer(value)
+            result[name] = value
+        return result
+
+    return serialize
+
+
+# Conditional GET: private responses are revalidated on every use, a matching If-None-Match gets a bodiless 304.
+# Validators come either from the encoded body (weak_etag) or, cheaper, from version parts known before
+# anything is serialized (version_etag over ids, updated_at watermarks, counters).
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(payload: bytes) -> str:
+    return f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def version_etag(*parts: Any) -> str:
+    return weak_etag(orjson.dumps(parts, default=str))
+
+
+def row_versions(rows: Any) -> list[tuple[Any, Any]]:
+    """(id, updated_at) of each row, the version part of a list: changes on edits, additions and removals."""
+    return [(row["id"], row.get("updated_at")) for row in map(_as_mapping, rows)]
+
+
+def _http_date(dt: datetime) -> str:
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def _set_validators(headers, etag: str, last_modified: datetime | None = None):
+    headers["etag"] = etag
+    headers["cache-control"] = REVALIDATE_CACHE_CONTROL
+    if last_modified is not None:
+        headers["last-modified"] = _http_date(last_modified)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as RFC 9110 requires for GET."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    # If-None-Match takes precedence, If-Modified-Since is only looked at without it (RFC 9110 13.2.2)
+    if "if-none-match" in request.headers:
+        return etag_matches(request, etag)
+    since = request.headers.get("if-modified-since")
+    if not since or last_modified is None:
+        return False
+    try:
+        since_dt = parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have second precision
+    return last_modified.replace(microsecond=0) <= since_dt
+
+
+def not_modified_response(etag: str, last_modified: datetime | None = None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    _set_validators(response.headers, etag, last_modified)
+    return response
+
+
+def conditional_response(
+    request: Request,
+    build: Callable[[], Response],
+    *,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response:
+    """Answer 304 when the client's validators still match, otherwise build (and serialize) the response."""
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response = build()
+    _set_validators(response.headers, etag, last_modified)
+    return response
+
+
+def fast_success_response(
+    *,
+    schema: type[BaseModel],
+    status_code: int = status.HTTP_200_OK,
+    data: Any = None,
+    message: str | None = None,
+    request: Request | None = None,
+) -> Response:
+    """Serialize rows straight to JSON bytes. With `request`, the body is tagged and a revalidation can get a 304."""
+    serialize = compile_serializer(schema)
+    if data is None:
+        serialized_data = None
+    elif isinstance(data, list):
+        serialized_data = [serialize(item) for item in data]
+    else:
+        serialized_data = serialize(data)
+
+    content = orjson.dumps({"code": status_code, "message": message, "data": serialized_data})
+    if request is None:
+        return Response(content=content, status_code=status_code, media_type="application/json")
+
+    return conditional_response(
+        request,
+        lambda: Response(content=content, status_code=status_code, media_type="application/json"),
+        etag=weak_etag(content),
+    )
+
+
+def ndjson_stream_response(stream: AsyncIterator[bytes], *, filename: str, compress: bool = False) -> StreamingResponse:
+    headers = {"content-disposition": f'attachment; filename="{filename}"'}
+    if compress:
+        headers["content-encoding"] = "gzip"
+    return StreamingResponse(stream, media_type="application/x-ndjson", headers=headers)
+
+
 def error_response(
     response: ORJSONResponse | None = None,
     *,
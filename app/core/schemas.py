@@ -3,7 +3,7 @@ from typing import Generic, TypeVar
 from zoneinfo import ZoneInfo
 
 from fastapi.encoders import jsonable_encoder
-from pydantic import BaseModel, ConfigDict, model_validator
+from pydantic import BaseModel, ConfigDict
 
 
 def datetime_to_gmt_str(dt: datetime) -> str:
@@ -21,7 +21,7 @@ class CustomModel(BaseModel):
 
     def serializable_dict(self, **kwargs):
         """Return a dict which contains only serializable fields."""
-        default_dict = self.model_dump()
+        default_dict = self.model_dump(**kwargs)
 
         return jsonable_encoder(default_dict)
 
@@ -32,6 +32,12 @@ class Pagination(CustomModel):
     total: int
 
 
+class KeysetPagination(CustomModel):
+    next_cursor: str | None
+    limit: int
+    total: int
+
+
 class CursorPagination(CustomModel):
     before: datetime | None = None
     after: datetime | None = None
@@ -45,9 +51,3 @@ class CustomResponse(CustomModel, Generic[T]):
     code: int
     message: str
     data: T | list[T] | None = None
-
-    @model_validator(mode="after")
-    def debug_usage(self):
-        print("created pydantic model")
-
-        return self
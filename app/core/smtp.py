@@ -0,0 +1,164 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import AsyncIterator, Iterable
+
+import aiosmtplib
+from loguru import logger
+
+from app.core.config import settings
+
+TRANSIENT_SMTP_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    OSError,
+)
+
+
+def is_transient_smtp_error(error: Exception) -> bool:
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 400 <= error.code < 500
+    return isinstance(error, TRANSIENT_SMTP_ERRORS)
+
+
+class SMTPPool:
+    """Fixed set of persistent SMTP connections shared by the ARQ worker.
+
+    Connections are opened (and logged in) lazily, kept open between jobs and
+    reopened after a failure. Messages handed to `send_many` go back to back over
+    one connection instead of one connect + STARTTLS + AUTH per email.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        start_tls: bool | None = None,
+        size: int = 4,
+        rate_limit: float = 0,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+    ):
+        self.size = size
+        self._client_kwargs = {
+            "hostname": hostname,
+            "port": port,
+            "username": username,
+            "password": password,
+            "start_tls": start_tls,
+        }
+        self._clients: asyncio.Queue[aiosmtplib.SMTP] = asyncio.Queue()
+        for _ in range(size):
+            self._clients.put_nowait(aiosmtplib.SMTP(**self._client_kwargs))
+
+        self._send_interval = 1 / rate_limit if rate_limit > 0 else 0
+        self._next_send_at = 0.0
+        self._throttle_lock = asyncio.Lock()
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        client = await self._clients.get()
+        try:
+            if not client.is_connected:
+                await client.connect()
+            yield client
+        except BaseException:
+            # Drop the session on any failure, it is reopened on next checkout
+            client.close()
+            raise
+        finally:
+            self._clients.put_nowait(client)
+
+    # Worker-wide rate limit, shared by every connection of the pool
+    async def _throttle(self):
+        if not self._send_interval:
+            return
+        async with self._throttle_lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_send_at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_send_at = max(self._next_send_at, loop.time()) + self._send_interval
+
+    async def send_many(self, messages: Iterable[EmailMessage]) -> int:
+        """Send messages over one pooled connection, returns how many were accepted.
+
+        Transient failures (disconnects, timeouts, 4xx) are retried with exponential
+        backoff, permanent ones are logged and the message is skipped.
+        """
+        pending = deque(messages)
+        sent = 0
+        attempt = 0
+
+        while pending:
+            try:
+                async with self.connection() as client:
+                    while pending:
+                        await self._throttle()
+                        await client.send_message(pending[0])
+                        pending.popleft()
+                        sent += 1
+                        attempt = 0
+            except Exception as e:
+                attempt += 1
+                if is_transient_smtp_error(e) and attempt <= self.max_retries:
+                    delay = self.retry_backoff * 2 ** (attempt - 1)
+                    logger.warning(
+                        "SMTP send failed ({error}), retry {attempt}/{max_retries} in {delay:.1f}s",
+                        error=e,
+                        attempt=attempt,
+                        max_retries=self.max_retries,
+                        delay=delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                logger.error("Send email failed to {email_to}: {error}", email_to=pending[0]["To"], error=e)
+                pending.popleft()
+                attempt = 0
+
+        return sent
+
+    async def send(self, message: EmailMessage) -> bool:
+        return await self.send_many([message]) == 1
+
+    async def send_batch(self, messages: list[EmailMessage]) -> int:
+        """Spread messages over every connection of the pool, returns how many were accepted."""
+        if not messages:
+            return 0
+        chunk_size = -(-len(messages) // self.size)
+        results = await asyncio.gather(
+            *(self.send_many(messages[start : start + chunk_size]) for start in range(0, len(messages), chunk_size))
+        )
+        return sum(results)
+
+    async def close(self):
+        while not self._clients.empty():
+            client = self._clients.get_nowait()
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except aiosmtplib.SMTPException:
+                    client.close()
+        logger.info("SMTP pool closed.")
+
+
+def create_smtp_pool() -> SMTPPool:
+    return SMTPPool(
+        hostname=settings.SMTP_HOST,
+        port=settings.SMTP_PORT,
+        # Empty credentials skip AUTH, e.g. against a local aiosmtpd
+        username=settings.SMTP_USER or None,
+        password=settings.SMTP_PASSWORD or None,
+        start_tls=settings.SMTP_TLS,
+        size=settings.SMTP_POOL_SIZE,
+        rate_limit=settings.SMTP_RATE_LIMIT,
+        max_retries=settings.SMTP_MAX_RETRIES,
+        retry_backoff=settings.SMTP_RETRY_BACKOFF,
+    )
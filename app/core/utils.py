@@ -113,3 +113,8 @@ def get_password_hash(password: str) -> str:
     salt = bcrypt.gensalt()
     hashed_password = bcrypt.hashpw(password=pwd_bytes, salt=salt)
     return hashed_password.decode("utf-8")
+
+
+def to_version(dt: datetime) -> int:
+    """Millisecond watermark of an updated_at column, cheap for clients to compare."""
+    return int(dt.timestamp() * 1000)
@@ -1,15 +1,30 @@
+import asyncio
+import time
+from collections import Counter
 from contextlib import asynccontextmanager
 
 from arq import create_pool
+from arq.constants import default_queue_name
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
-from loguru import logger
 from socketio.asgi import ASGIApp
 
 from app.core.arq_worker import REDIS_SETTINGS
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.idempotency import IdempotentReplay
+from app.core.logger import logger, should_sample
+from app.core.metrics import (
+    DB_REPEATED_QUERY_SHAPES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_QUERIES,
+    start_metrics_server,
+    stop_metrics,
+    track_queue_depth,
+)
+from app.core.query_budget import RequestStats, request_stats
 from app.core.response import error_response
 from app.core.routes import api_router
 from app.modules.notifications.realtime.socketio_app import sio
@@ -22,17 +37,31 @@ async def lifespan(app: FastAPI):
         logger.info("starting...")
         app.state.arq_redis = await create_pool(REDIS_SETTINGS)
     except Exception as e:
-        logger.error(f"Redis PubSub start failed: {e}")
+        logger.error("Redis PubSub start failed: {}", e)
         app.state.arq_redis = None
 
+    queue_depth_task = None
+    if settings.METRICS_ENABLED:
+        # Scraped from an internal port, like the ARQ worker's, so metrics are never served with the API
+        start_metrics_server(settings.METRICS_PORT)
+        if app.state.arq_redis:
+            queue_depth_task = asyncio.create_task(
+                track_queue_depth(app.state.arq_redis, default_queue_name, settings.ARQ_QUEUE_DEPTH_INTERVAL)
+            )
+
     yield
 
+    if queue_depth_task:
+        queue_depth_task.cancel()
+    if settings.METRICS_ENABLED:
+        stop_metrics()
+
     try:
         logger.info("stopping...")
         if app.state.arq_redis:
             await app.state.arq_redis.close()
     except Exception as e:
-        logger.error(f"Redis PubSub stop failed: {e}")
+        logger.error("Redis PubSub stop failed: {}", e)
 
 
 fastapi_app = FastAPI(
@@ -51,17 +80,86 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+fastapi_app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    cache_max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+)
+
 
 @fastapi_app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"New request: {request.method} {request.url}")
+    started_at = time.perf_counter()
     try:
         response = await call_next(request)
-        return response
     except Exception as e:
-        logger.exception("Unhandled error occurred")
+        logger.exception("Unhandled error occurred: {method} {path}", method=request.method, path=request.url.path)
         raise e
 
+    # Sample by route template so hot endpoints can be logged at a lower rate than rare ones
+    route = request.scope.get("route")
+    route_key = f"{request.method} {route.path if route else request.url.path}"
+    if should_sample(route_key) or response.status_code >= 500:
+        logger.info(
+            "{route} {status_code} {duration_ms:.1f}ms",
+            route=route_key,
+            status_code=response.status_code,
+            duration_ms=(time.perf_counter() - started_at) * 1000,
+        )
+    return response
+
+
+@fastapi_app.middleware("http")
+async def track_requests(request: Request, call_next):
+    # Reuse stats already set by the caller, e.g. a test wrapped in assert_max_queries
+    stats = request_stats.get()
+    token = None
+    if stats is None:
+        stats = RequestStats(shapes=Counter() if settings.QUERY_DEBUG else None)
+        token = request_stats.set(stats)
+    started_at = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        if token:
+            request_stats.reset(token)
+
+    route = request.scope.get("route")
+    # Unmatched paths share one label so random URLs can't blow up the series count
+    route_path = route.path if route else "unmatched"
+
+    if settings.METRICS_ENABLED:
+        HTTP_REQUEST_DURATION.labels(request.method, route_path, response.status_code).observe(
+            time.perf_counter() - started_at
+        )
+        HTTP_REQUEST_QUERIES.labels(request.method, route_path).observe(stats.queries)
+
+    if stats.shapes is not None:
+        repeated = stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD)
+        response.headers["X-DB-Queries"] = str(stats.queries)
+        response.headers["X-DB-Query-Shapes"] = str(len(stats.shapes))
+        response.headers["X-DB-Repeated-Shapes"] = str(len(repeated))
+        if repeated:
+            DB_REPEATED_QUERY_SHAPES.labels(request.method, route_path).inc(len(repeated))
+            logger.warning(
+                "Possible N+1 on {method} {route}: {repeated}",
+                method=request.method,
+                route=route_path,
+                repeated=repeated,
+            )
+        if stats.queries > settings.QUERY_BUDGET:
+            logger.warning(
+                "Query budget exceeded on {method} {route}: {queries} > {budget}",
+                method=request.method,
+                route=route_path,
+                queries=stats.queries,
+                budget=settings.QUERY_BUDGET,
+            )
+    return response
+
 
 @fastapi_app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -81,10 +179,18 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     return error_response(status_code=422, message=formatted_errors)
 
 
+@fastapi_app.exception_handler(IdempotentReplay)
+async def idempotent_replay_handler(request: Request, exc: IdempotentReplay):
+    return exc.to_response()
+
+
 @fastapi_app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    print(">>>>>>>>>>>>", exc, exc.status_code)
-    return error_response(status_code=exc.status_code, message=exc.detail)
+    response = error_response(status_code=exc.status_code, message=exc.detail)
+    if exc.headers:
+        # e.g. Retry-After on 429 / 503
+        response.headers.update(exc.headers)
+    return response
 
 
 fastapi_app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -6,23 +6,36 @@ from redis.asyncio import Redis
 from sqlalchemy import Row
 
 from app.core.config import settings
-from app.core.deps import get_redis_client
-from app.modules.auth.exceptions import InvalidPermission
+from app.core.deps import RedisDep, get_redis_client
+from app.modules.auth.exceptions import InvalidCredentials, InvalidPermission
 from app.modules.auth.interface import IAuthService
 from app.modules.auth.scheme import oauth2_scheme
 from app.modules.auth.services import AuthService
+from app.modules.auth.sessions import SessionStore
 from app.modules.notifications.async_tasks.deps import AsyncNotificationServiceDep
 from app.modules.users.deps import UserServiceDep
 
 
+def get_session_store(redis: RedisDep) -> SessionStore:
+    return SessionStore(redis=redis)
+
+
+SessionStoreDep = Annotated[SessionStore, Depends(get_session_store)]
+
+
 def get_auth_service(
     user_service: UserServiceDep,
     async_notification_service: AsyncNotificationServiceDep,
     redis: Annotated[Redis, Depends(get_redis_client)],
     response: ORJSONResponse,
+    session_store: SessionStoreDep,
 ) -> IAuthService:
     return AuthService(
-        user_service=user_service, async_notification_service=async_notification_service, redis=redis, response=response
+        user_service=user_service,
+        async_notification_service=async_notification_service,
+        redis=redis,
+        response=response,
+        session_store=session_store,
     )
 
 
@@ -32,9 +45,13 @@ AuthServiceDep = Annotated[IAuthService, Depends(get_auth_service)]
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     user_service: UserServiceDep,
+    session_store: SessionStoreDep,
 ) -> Row:
-    user = await user_service.get_user_from_token(token=token, secret_key=settings.ACCESS_SECRET_KEY)
-    return user
+    payload = user_service.decode_token(token=token, secret_key=settings.ACCESS_SECRET_KEY)
+    # A revoked token is turned away before the user is loaded
+    if await session_store.is_token_revoked(user_id=str(payload["sub"]), token_version=payload.get("ver", 0)):
+        raise InvalidCredentials
+    return await user_service.get_user_from_payload(payload=payload)
 
 
 UserDep = Annotated[Row, Depends(get_current_user)]
@@ -31,6 +31,11 @@ class InvalidPermission(AuthDetailedHTTPException):
     DETAIL = "Invalid permission"
 
 
+class SessionNotFound(AuthDetailedHTTPException):
+    STATUS_CODE = status.HTTP_404_NOT_FOUND
+    DETAIL = "Session not found"
+
+
 # ValidationError
 class AuthValidationError(RequestValidationError):
     STATUS_CODE: int = status.HTTP_422_UNPROCESSABLE_ENTITY
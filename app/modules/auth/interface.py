@@ -4,6 +4,7 @@
 from abc import ABC, abstractmethod
 
 from pydantic import EmailStr
+from sqlalchemy import Row
 
 from app.modules.auth.schemas import (
     ChangePassword,
@@ -22,11 +23,23 @@ class IAuthService(ABC):
         pass
 
     @abstractmethod
-    async def login(self, data: Login):
+    async def login(self, data: Login, user_agent: str | None = None, ip_address: str | None = None):
         pass
 
     @abstractmethod
-    async def logout(self):
+    async def logout(self, refresh_token: str | None = None):
+        pass
+
+    @abstractmethod
+    async def logout_all(self, user: Row):
+        pass
+
+    @abstractmethod
+    async def get_sessions(self, user: Row, refresh_token: str | None = None):
+        pass
+
+    @abstractmethod
+    async def revoke_session(self, user: Row, session_id: str):
         pass
 
     @abstractmethod
@@ -1,7 +1,8 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Cookie, status
+from fastapi import APIRouter, Cookie, Depends, Request, status
 
+from app.core.rate_limit import RateLimit, client_ip
 from app.core.response import success_response
 from app.core.schemas import CustomResponse
 from app.modules.auth.deps import AuthServiceDep, UserDep
@@ -12,6 +13,7 @@ from app.modules.auth.schemas import (
     Register,
     RequestVerifyEmail,
     ResetPassword,
+    SessionRead,
     VerifyEmail,
 )
 
@@ -34,24 +36,55 @@ async def register(
     )
 
 
-@auth_router.post("/login", response_model=CustomResponse)
+@auth_router.post("/login", response_model=CustomResponse, dependencies=[Depends(RateLimit("login"))])
 async def login(
+    request: Request,
     auth_service: AuthServiceDep,
     data: Login,
 ):
-    response = await auth_service.login(data=data)
+    response = await auth_service.login(
+        data=data, user_agent=request.headers.get("user-agent"), ip_address=client_ip(request)
+    )
     return success_response(response=response, message="Login successfully")
 
 
 @auth_router.post("/logout", response_model=CustomResponse)
 async def logout(
     auth_service: AuthServiceDep,
+    refresh_token: Annotated[str | None, Cookie(alias="refresh_token")] = None,
 ):
-    response = await auth_service.logout()
+    response = await auth_service.logout(refresh_token=refresh_token)
     return success_response(response=response, message="Logout successfully")
 
 
-@auth_router.post("/forgot-password", response_model=CustomResponse)
+@auth_router.post("/logout-all", response_model=CustomResponse)
+async def logout_all(auth_service: AuthServiceDep, user: UserDep):
+    response = await auth_service.logout_all(user=user)
+    return success_response(response=response, message="Logged out from all devices successfully")
+
+
+@auth_router.get("/sessions", response_model=CustomResponse[list[SessionRead]])
+async def get_sessions(
+    auth_service: AuthServiceDep,
+    user: UserDep,
+    refresh_token: Annotated[str | None, Cookie(alias="refresh_token")] = None,
+):
+    sessions = await auth_service.get_sessions(user=user, refresh_token=refresh_token)
+    return success_response(
+        data=[SessionRead.model_validate(session) for session in sessions],
+        message="Sessions retrieved successfully",
+    )
+
+
+@auth_router.delete("/sessions/{session_id}", response_model=CustomResponse)
+async def revoke_session(auth_service: AuthServiceDep, user: UserDep, session_id: str):
+    await auth_service.revoke_session(user=user, session_id=session_id)
+    return success_response(message="Session revoked successfully")
+
+
+@auth_router.post(
+    "/forgot-password", response_model=CustomResponse, dependencies=[Depends(RateLimit("forgot_password"))]
+)
 async def forgot_password(
     auth_service: AuthServiceDep,
     data: ForgotPassword,
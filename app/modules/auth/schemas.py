@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -35,3 +37,13 @@ class ResetPassword(BaseModel):
 class ChangePassword(BaseModel):
     old_password: str
     new_password: str
+
+
+class SessionRead(BaseModel):
+    id: str
+    user_agent: str | None = None
+    ip_address: str | None = None
+    created_at: datetime
+    last_used_at: datetime
+    expires_at: datetime
+    current: bool = False
@@ -0,0 +1,93 @@
+# Lua scripts behind SessionStore. Each runs atomically in one round trip, so concurrent logins / refreshes
+# cannot interleave. A user's sessions are the fields of one hash, session id -> json record:
+#   live session: {refresh_token, created_at, last_used_at, expires_at, user_agent, ip_address}
+#   tombstone:    {rotated_to, rotated_at, expires_at}, left by a rotation to detect refresh token reuse
+# Times are Redis TIME in ms. Fields have no TTL of their own, expired ones are pruned by the scripts.
+
+_NOW = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+"""
+
+# KEYS: user sessions hash, user token version
+# ARGV: session id, record (json), ttl in ms, max devices
+# Returns {sessions evicted by the device limit, token version}.
+CREATE_SESSION_SCRIPT = (
+    _NOW
+    + """
+local ttl = tonumber(ARGV[3])
+local live = {}
+local fields = redis.call('HGETALL', KEYS[1])
+for i = 1, #fields, 2 do
+    local session = cjson.decode(fields[i + 1])
+    if session.expires_at <= now then
+        redis.call('HDEL', KEYS[1], fields[i])
+    elseif not session.rotated_to then
+        table.insert(live, {fields[i], session.created_at})
+    end
+end
+
+-- Newest first, the oldest ones beyond MAX_DEVICES - 1 make room for the new session
+table.sort(live, function(a, b) return a[2] > b[2] end)
+local evicted = 0
+for i = tonumber(ARGV[4]), #live do
+    redis.call('HDEL', KEYS[1], live[i][1])
+    evicted = evicted + 1
+end
+
+local record = cjson.decode(ARGV[2])
+record.created_at = now
+record.last_used_at = now
+record.expires_at = now + ttl
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(record))
+if redis.call('PTTL', KEYS[1]) < ttl then
+    redis.call('PEXPIRE', KEYS[1], ttl)
+end
+return {evicted, tonumber(redis.call('GET', KEYS[2]) or 0)}
+"""
+)
+
+# KEYS: user sessions hash, user token version
+# ARGV: presented session id, new session id, reuse grace in ms
+# Returns {status, refresh_token, session_id, ttl_ms, token_version}, status being:
+#   "missing": unknown, expired or evicted session
+#   "rotated": the session moved to the new id, its old id is left as a tombstone until it would have expired
+#   "reused":  an already rotated id came back after the grace period, every session of the user is revoked
+# A rotated id presented again within the grace period (e.g. two tabs refreshing at once) gets its
+# successor back instead of being treated as reuse.
+ROTATE_SESSION_SCRIPT = (
+    _NOW
+    + """
+local raw = redis.call('HGET', KEYS[1], ARGV[1])
+if not raw then
+    return {'missing'}
+end
+local session = cjson.decode(raw)
+if session.expires_at <= now then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+    return {'missing'}
+end
+local version = tonumber(redis.call('GET', KEYS[2]) or 0)
+
+if session.rotated_to then
+    local successor = redis.call('HGET', KEYS[1], session.rotated_to)
+    if successor and now - session.rotated_at <= tonumber(ARGV[3]) then
+        local next_session = cjson.decode(successor)
+        if not next_session.rotated_to then
+            return {'rotated', next_session.refresh_token, session.rotated_to, next_session.expires_at - now, version}
+        end
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('INCR', KEYS[2])
+    return {'reused'}
+end
+
+-- The session keeps its creation time, for the device limit, and its absolute expiry
+session.last_used_at = now
+redis.call('HSET', KEYS[1], ARGV[2], cjson.encode(session))
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode({
+    rotated_to = ARGV[2], rotated_at = now, expires_at = session.expires_at,
+}))
+return {'rotated', session.refresh_token, ARGV[2], session.expires_at - now, version}
+"""
+)
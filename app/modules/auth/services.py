@@ -1,22 +1,23 @@
-import json
-from datetime import datetime, timezone
-from uuid import uuid4
+from datetime import datetime, timedelta, timezone
 
 from fastapi.responses import ORJSONResponse
+from loguru import logger
 from pydantic import EmailStr
 from redis.asyncio import Redis
 from sqlalchemy import Row
 
 from app.core.config import settings
-from app.core.utils import delete_redis_value, get_password_hash, get_redis_value, set_redis_value, verify_password
+from app.core.utils import delete_redis_value, get_password_hash, get_redis_value, verify_password
 from app.modules.auth.exceptions import (
     AuthEmailValidationError,
     AuthPasswordValidationError,
     InvalidCredentials,
     InvalidToken,
+    SessionNotFound,
 )
 from app.modules.auth.interface import IAuthService
 from app.modules.auth.schemas import ChangePassword, Login, Register
+from app.modules.auth.sessions import SessionReuseDetected, SessionStore
 from app.modules.auth.utils import generate_token, set_token_cookies
 from app.modules.notifications.async_tasks.interface import (
     EmailResetPassword,
@@ -25,8 +26,6 @@ from app.modules.notifications.async_tasks.interface import (
 )
 from app.modules.users.interface import IUserService, UserDBCreate, UserDBUpdate
 
-MAX_DEVICES = 3
-
 
 class AuthService(IAuthService):
     def __init__(
@@ -35,8 +34,10 @@ class AuthService(IAuthService):
         async_notification_service: IAsyncNotificationService,
         redis: Redis | None = None,
         response: ORJSONResponse | None = None,
+        session_store: SessionStore | None = None,
     ):
         self.redis = redis
+        self.session_store = session_store
         self.response = response
         self.user_service = user_service
         self.async_notification_service = async_notification_service
@@ -73,20 +74,10 @@ class AuthService(IAuthService):
         await self.user_service.update_user(user_id=user.id, data=UserDBUpdate(is_verified=True))
         await delete_redis_value(redis=self.redis, name=f"verify_token_{token}")
 
-    async def login(self, data: Login):
+    async def login(self, data: Login, user_agent: str | None = None, ip_address: str | None = None):
         user = await self.user_service.authenticate_user(email=data.email, password=data.password)
 
-        # Generate access token
-        access_token, access_expires_at = generate_token(
-            "access_token",
-            settings.ACCESS_SECRET_KEY,
-            settings.ALGORITHM,
-            settings.ACCESS_TOKEN_EXPIRE_MINUTES,
-            str(user.id),
-        )
-
         # Create refresh token for multiple devices
-        refresh_token_id = str(uuid4())
         refresh_token, refresh_expires_at = generate_token(
             "refresh_token",
             settings.REFRESH_SECRET_KEY,
@@ -95,39 +86,27 @@ class AuthService(IAuthService):
             str(user.id),
         )
 
-        # Store refresh token by refresh_token_id
-        await set_redis_value(
-            redis=self.redis,
-            name=f"refresh_token:{refresh_token_id}",
-            value=json.dumps(
-                {
-                    "user_id": str(user.id),
-                    "refresh_token": refresh_token,
-                    "created_at": datetime.now(tz=timezone.utc).isoformat(),
-                }
-            ),
-            expires_in=refresh_expires_at,
+        # Open a session for it, kicking out the oldest devices over MAX_DEVICES
+        session = await self.session_store.create(
+            user_id=str(user.id), refresh_token=refresh_token, user_agent=user_agent, ip_address=ip_address
         )
 
-        # Track all token_ids for this user
-        await self.redis.lpush(f"user_refresh_tokens:{user.id}", refresh_token_id)
-
-        # Enforce device limit: kick out oldest if necessary
-        token_ids = await self.redis.lrange(f"user_refresh_tokens:{user.id}", 0, -1)
-        if len(token_ids) > MAX_DEVICES:
-            excess_ids = token_ids[MAX_DEVICES:]
-            for token_id in excess_ids:
-                await self.redis.delete(f"refresh_token:{token_id}")
-                await self.redis.lrem(f"user_refresh_tokens:{user.id}", 0, token_id)
-        # Ensure only MAX_DEVICES are stored
-        await self.redis.ltrim(f"user_refresh_tokens:{user.id}", 0, MAX_DEVICES - 1)
+        # Generate access token
+        access_token, access_expires_at = generate_token(
+            "access_token",
+            settings.ACCESS_SECRET_KEY,
+            settings.ALGORITHM,
+            settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+            str(user.id),
+            token_version=session.token_version,
+        )
 
         # Set cookies
         set_token_cookies(
             self.response,
             access_token,
             access_expires_at,
-            refresh_token_id,  # Return refresh_token_id instead of refresh_token
+            session.cookie,  # Return the session instead of refresh_token
             refresh_expires_at,
         )
 
@@ -139,7 +118,11 @@ class AuthService(IAuthService):
 
         return self.response
 
-    async def logout(self):
+    async def logout(self, refresh_token: str | None = None):
+        session = self.session_store.parse_cookie(refresh_token)
+        if session:
+            await self.session_store.revoke(*session)
+
         self.response.delete_cookie("access_token")
         self.response.delete_cookie("refresh_token")
 
@@ -173,6 +156,8 @@ class AuthService(IAuthService):
             data=UserDBUpdate(hashed_password=get_password_hash(password)),
         )
         await delete_redis_value(redis=self.redis, name=f"reset_password_token_{token}")
+        # Whoever knew the old password may be signed in somewhere, sign out every device
+        await self.session_store.revoke_all(user_id=str(user.id))
 
     async def change_password(self, user: Row, data: ChangePassword):
         if not verify_password(data.old_password, user.hashed_password):
@@ -182,6 +167,36 @@ class AuthService(IAuthService):
             user_id=user.id,
             data=UserDBUpdate(hashed_password=get_password_hash(data.new_password)),
         )
+        # Sign out every device, including access tokens already issued
+        await self.session_store.revoke_all(user_id=str(user.id))
+
+    async def logout_all(self, user: Row):
+        await self.session_store.revoke_all(user_id=str(user.id))
+
+        self.response.delete_cookie("access_token")
+        self.response.delete_cookie("refresh_token")
+
+        return self.response
+
+    async def get_sessions(self, user: Row, refresh_token: str | None = None) -> list[dict]:
+        current = self.session_store.parse_cookie(refresh_token)
+        current_session_id = current[1] if current else None
+        sessions = await self.session_store.list_sessions(user_id=str(user.id))
+        return [
+            {
+                **session,
+                **{
+                    field: datetime.fromtimestamp(session[field] / 1000, tz=timezone.utc)
+                    for field in ("created_at", "last_used_at", "expires_at")
+                },
+                "current": session["id"] == current_session_id,
+            }
+            for session in sessions
+        ]
+
+    async def revoke_session(self, user: Row, session_id: str):
+        if not await self.session_store.revoke(user_id=str(user.id), session_id=session_id):
+            raise SessionNotFound
 
     async def request_verify_email(self, email: EmailStr):
         user = await self.user_service.get_user_by_email(email=email)
@@ -202,17 +217,22 @@ class AuthService(IAuthService):
         if refresh_token is None:
             raise InvalidCredentials(detail="Invalid refresh token")
 
-        redis_token_key = f"refresh_token:{refresh_token}"  # refresh_token here is refresn_token_id
-        stored = await get_redis_value(redis=self.redis, name=redis_token_key)
-        if not stored:
+        # refresh_token here is the session cookie, the session id is rotated on every use
+        parsed = self.session_store.parse_cookie(refresh_token)
+        if parsed is None:
             raise InvalidCredentials(detail="Invalid refresh token")
 
-        data = json.loads(stored)
-        stored_refresh_token = data.get("refresh_token")
-        user_id = data.get("user_id")
+        user_id, session_id = parsed
+        try:
+            session = await self.session_store.rotate(user_id=user_id, session_id=session_id)
+        except SessionReuseDetected:
+            logger.warning("Refresh token reuse detected, revoked all sessions of user {user_id}", user_id=user_id)
+            raise InvalidCredentials(detail="Invalid refresh token")
+        if session is None:
+            raise InvalidCredentials(detail="Invalid refresh token")
 
         user = await self.user_service.get_user_from_token(
-            token=stored_refresh_token, secret_key=settings.REFRESH_SECRET_KEY
+            token=session.refresh_token, secret_key=settings.REFRESH_SECRET_KEY
         )
 
         if user is None or str(user.id) != user_id:
@@ -224,10 +244,17 @@ class AuthService(IAuthService):
             settings.ALGORITHM,
             settings.ACCESS_TOKEN_EXPIRE_MINUTES,
             str(user.id),
+            token_version=session.token_version,
         )
 
-        # Step 4: Set the new access token as an HTTP-only cookie
-        set_token_cookies(self.response, access_token, access_expires_at)
+        # Step 4: Set the new access token and the rotated session as HTTP-only cookies
+        set_token_cookies(
+            self.response,
+            access_token,
+            access_expires_at,
+            session.cookie,
+            datetime.now(tz=timezone.utc) + timedelta(milliseconds=session.ttl_ms),
+        )
 
         # Step 5: Update the user's last login timestamp and activate the user
         await self.user_service.update_user(
@@ -0,0 +1,145 @@
+import json
+import time
+from dataclasses import dataclass
+from uuid import uuid4
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from app.core.config import settings
+from app.modules.auth.scripts import CREATE_SESSION_SCRIPT, ROTATE_SESSION_SCRIPT
+
+SESSIONS_KEY_PREFIX = "sessions:"
+TOKEN_VERSION_KEY_PREFIX = "token_version:"
+# A rotated refresh token presented again within this window is a concurrent refresh, not a reuse
+REFRESH_REUSE_GRACE_MS = 10_000
+# The refresh cookie carries "<user_id>.<session_id>" so a session is found with a single HGET
+SESSION_COOKIE_SEPARATOR = "."
+
+
+@dataclass
+class IssuedSession:
+    session_id: str
+    cookie: str
+    refresh_token: str
+    ttl_ms: int
+    token_version: int
+
+
+class SessionReuseDetected(Exception):
+    pass
+
+
+class SessionStore:
+    """Refresh token sessions in Redis: one hash per user, session id -> record.
+
+    Creating and rotating a session are single Lua scripts (see scripts.py). Revoking one session is an
+    HDEL, "log out everywhere" deletes the hash and bumps the user's token version. Access tokens carry
+    the version they were issued at, so checking them against revocations is one GET of an integer.
+    """
+
+    # A store is built per request, the registered scripts (source and SHA1) are kept for the process and run
+    # with each store's client
+    _scripts: dict[str, AsyncScript] = {}
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    def _script(self, source: str) -> AsyncScript:
+        script = self._scripts.get(source)
+        if script is None:
+            # EVALSHA, the script is loaded again by redis-py on NOSCRIPT
+            script = self._scripts[source] = self.redis.register_script(source)
+        return script
+
+    @staticmethod
+    def _sessions_key(user_id: str) -> str:
+        return f"{SESSIONS_KEY_PREFIX}{user_id}"
+
+    @staticmethod
+    def _version_key(user_id: str) -> str:
+        return f"{TOKEN_VERSION_KEY_PREFIX}{user_id}"
+
+    @staticmethod
+    def parse_cookie(cookie: str | None) -> tuple[str, str] | None:
+        user_id, _, session_id = (cookie or "").partition(SESSION_COOKIE_SEPARATOR)
+        if not user_id or not session_id:
+            return None
+        return user_id, session_id
+
+    async def create(
+        self,
+        user_id: str,
+        refresh_token: str,
+        user_agent: str | None = None,
+        ip_address: str | None = None,
+    ) -> IssuedSession:
+        """Open a session, evicting the oldest ones over settings.MAX_DEVICES."""
+        session_id = str(uuid4())
+        ttl_ms = settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60 * 1000
+        _, token_version = await self._script(CREATE_SESSION_SCRIPT)(
+            keys=[self._sessions_key(user_id), self._version_key(user_id)],
+            args=[
+                session_id,
+                json.dumps({"refresh_token": refresh_token, "user_agent": user_agent, "ip_address": ip_address}),
+                ttl_ms,
+                settings.MAX_DEVICES,
+            ],
+            client=self.redis,
+        )
+        return IssuedSession(
+            session_id=session_id,
+            cookie=f"{user_id}{SESSION_COOKIE_SEPARATOR}{session_id}",
+            refresh_token=refresh_token,
+            ttl_ms=ttl_ms,
+            token_version=token_version,
+        )
+
+    async def rotate(self, user_id: str, session_id: str) -> IssuedSession | None:
+        """Move a session to a new id. None if it does not exist, raises SessionReuseDetected on a replayed id."""
+        result = await self._script(ROTATE_SESSION_SCRIPT)(
+            keys=[self._sessions_key(user_id), self._version_key(user_id)],
+            args=[session_id, str(uuid4()), REFRESH_REUSE_GRACE_MS],
+            client=self.redis,
+        )
+        if result[0] == "reused":
+            raise SessionReuseDetected(user_id)
+        if result[0] != "rotated":
+            return None
+
+        _, refresh_token, new_session_id, ttl_ms, token_version = result
+        return IssuedSession(
+            session_id=new_session_id,
+            cookie=f"{user_id}{SESSION_COOKIE_SEPARATOR}{new_session_id}",
+            refresh_token=refresh_token,
+            ttl_ms=ttl_ms,
+            token_version=token_version,
+        )
+
+    async def list_sessions(self, user_id: str) -> list[dict]:
+        """Live sessions of a user, most recently used first."""
+        records = await self.redis.hgetall(self._sessions_key(user_id))
+        # Expired fields are only pruned by the scripts, skip them and the rotation tombstones
+        now_ms = time.time() * 1000
+        sessions = []
+        for session_id, raw in records.items():
+            session = json.loads(raw)
+            if "rotated_to" in session or session["expires_at"] <= now_ms:
+                continue
+            session.pop("refresh_token", None)
+            sessions.append({"id": session_id, **session})
+        return sorted(sessions, key=lambda session: session["last_used_at"], reverse=True)
+
+    async def revoke(self, user_id: str, session_id: str) -> bool:
+        return bool(await self.redis.hdel(self._sessions_key(user_id), session_id))
+
+    async def revoke_all(self, user_id: str):
+        """Log out everywhere: drop every session and invalidate the access tokens already issued."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._sessions_key(user_id))
+            pipe.incr(self._version_key(user_id))
+            await pipe.execute()
+
+    async def is_token_revoked(self, user_id: str, token_version: int) -> bool:
+        current = await self.redis.get(self._version_key(user_id))
+        return current is not None and int(current) > token_version
@@ -19,6 +19,7 @@ def generate_token(
     algorithm: str,
     expires_minutes: int,
     user_id: str,
+    token_version: int | None = None,
 ) -> dict:
     created_at = datetime.now(timezone.utc)
     expires_at = created_at + timedelta(minutes=expires_minutes)
@@ -29,6 +30,9 @@ def generate_token(
         "exp": expires_at,
         "type": token_type,
     }
+    if token_version is not None:
+        # Compared with the user's token version on each request, see SessionStore
+        token_payload["ver"] = token_version
 
     token = jwt.encode(
         payload=token_payload,
@@ -28,3 +28,8 @@ class ChannelMembershipNotFound(ChannelDetailedHTTPException):
 class ChannelMembershipPermissionDenied(ChannelDetailedHTTPException):
     STATUS_CODE = status.HTTP_403_FORBIDDEN
     DETAIL = "Permission denied"
+
+
+class ChannelBadRequest(ChannelDetailedHTTPException):
+    STATUS_CODE = status.HTTP_400_BAD_REQUEST
+    DETAIL = "Bad request"
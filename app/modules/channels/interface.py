@@ -3,7 +3,9 @@ from abc import ABC, abstractmethod
 from app.modules.channels.schemas import (
     ChannelCreate,
     ChannelDelete,
+    ChannelMembersAdd,
     ChannelMembershipRoleUpdate,
+    ChannelSidebarRead,  # noqa F401
     ChannelTransfer,
     ChannelUpdate,
 )
@@ -22,6 +24,14 @@ class IChannelService(ABC):
     async def get_channel_members(self, workspace_id: str, channel_ids: list[str]):
         pass
 
+    @abstractmethod
+    async def get_sidebar(self, workspace_id: str, user_id: str, type: str | None = None):
+        pass
+
+    @abstractmethod
+    async def get_channel_member_page(self, workspace_id: str, channel_id: str, cursor: str | None, limit: int):
+        pass
+
     @abstractmethod
     async def search_channels(self, workspace_id: str, user_id: str, query: str):
         pass
@@ -54,6 +64,10 @@ class IChannelService(ABC):
     ):
         pass
 
+    @abstractmethod
+    async def increment_unread_counts(self, workspace_id: str, channel_id: str, user_ids: list[str]):
+        pass
+
     @abstractmethod
     async def set_channel_role(self, workspace_id: str, channel_id: str, data: ChannelMembershipRoleUpdate):
         pass
@@ -66,6 +80,10 @@ class IChannelService(ABC):
     async def join_channel(self, workspace_id: str, channel_id: str, user_id: str):
         pass
 
+    @abstractmethod
+    async def add_channel_members(self, workspace_id: str, channel_id: str, data: ChannelMembersAdd):
+        pass
+
     @abstractmethod
     async def leave_channel(self, workspace_id: str, channel_id: str, user_id: str):
         pass
@@ -26,6 +26,7 @@ Channel = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
 )
 
@@ -54,6 +55,9 @@ ChannelMembership = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
     Index(None, "channel_id", unique=True, postgresql_where=text("role = 'owner'")),
+    # Keyset pagination of members in role order
+    Index("channel_memberships_channel_id_role_user_id_idx", "channel_id", "role", "user_id"),
 )
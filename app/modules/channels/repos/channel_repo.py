@@ -1,7 +1,8 @@
-from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy import and_, delete, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from app.modules.channels.models import Channel, ChannelMembership
+from app.modules.messages.models import Message
 
 
 class ChannelRepo:
@@ -33,6 +34,54 @@ class ChannelRepo:
         result = await self.db.execute(stmt)
         return result.fetchall()
 
+    async def get_sidebar_list_by_workspace_and_user(self, workspace_id: str, user_id: str, type: str | None = None):
+        """The user's channels with their membership flags, member count and last activity, in one statement."""
+        members = ChannelMembership.alias("members")
+        member_count = (
+            select(func.count()).select_from(members).where(members.c.channel_id == Channel.c.id).scalar_subquery()
+        )
+        last_message_at = select(func.max(Message.c.created_at)).where(Message.c.channel_id == Channel.c.id)
+        last_activity_at = func.coalesce(last_message_at.scalar_subquery(), Channel.c.created_at)
+
+        stmt = (
+            select(
+                Channel.c.id,
+                Channel.c.workspace_id,
+                Channel.c.name,
+                Channel.c.description,
+                Channel.c.type,
+                Channel.c.is_private,
+                Channel.c.created_at,
+                ChannelMembership.c.role,
+                ChannelMembership.c.is_starred,
+                ChannelMembership.c.is_muted,
+                ChannelMembership.c.unread_count,
+                ChannelMembership.c.last_read_at,
+                member_count.label("member_count"),
+                last_activity_at.label("last_activity_at"),
+            )
+            .select_from(
+                Channel.join(
+                    ChannelMembership,
+                    and_(
+                        ChannelMembership.c.channel_id == Channel.c.id,
+                        ChannelMembership.c.user_id == user_id,
+                    ),
+                )
+            )
+            .where(
+                Channel.c.workspace_id == workspace_id,
+                Channel.c.deleted_at.is_(None),
+            )
+            .order_by(ChannelMembership.c.is_starred.desc(), last_activity_at.desc(), Channel.c.id)
+        )
+
+        if type:
+            stmt = stmt.where(Channel.c.type == type)
+
+        result = await self.db.execute(stmt)
+        return result.fetchall()
+
     async def search_list_by_workspace_and_user_with_query(self, workspace_id: str, user_id: str, query: str):
         stmt = (
             select(*Channel.c)
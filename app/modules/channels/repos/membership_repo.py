@@ -1,7 +1,12 @@
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from app.modules.channels.models import ChannelMembership
+from app.modules.users.models import User
+
+# asyncpg caps a statement at 32767 bind parameters
+BULK_INSERT_CHUNK_SIZE = 1000
 
 
 class ChannelMembershipRepo:
@@ -24,6 +29,55 @@ class ChannelMembershipRepo:
         result = await self.db.execute(stmt)
         return result.fetchall()
 
+    async def get_member_page(self, workspace_id: str, channel_id: str, after: tuple[str, str] | None, limit: int):
+        """Members joined with their user row, keyset ordered by (role, user_id) off the composite index.
+
+        Roles sort in enum order, so owners and admins come first. `after` is the (role, user_id) of
+        the last row of the previous page.
+        """
+        user_columns = [column for column in User.c if column.name not in ("hashed_password", "created_at")]
+        stmt = (
+            select(
+                *user_columns,
+                ChannelMembership.c.role,
+                ChannelMembership.c.is_starred,
+                ChannelMembership.c.is_muted,
+                ChannelMembership.c.unread_count,
+                ChannelMembership.c.last_read_at,
+                ChannelMembership.c.created_at,
+            )
+            .select_from(ChannelMembership.join(User, User.c.id == ChannelMembership.c.user_id))
+            .where(
+                ChannelMembership.c.workspace_id == workspace_id,
+                ChannelMembership.c.channel_id == channel_id,
+            )
+            .order_by(ChannelMembership.c.role, ChannelMembership.c.user_id)
+            .limit(limit)
+        )
+        if after:
+            role, user_id = after
+            stmt = stmt.where(
+                tuple_(ChannelMembership.c.role, ChannelMembership.c.user_id)
+                > tuple_(literal(role, ChannelMembership.c.role.type), literal(user_id))
+            )
+        result = await self.db.execute(stmt)
+        return result.fetchall()
+
+    async def count_by_workspace_and_channel(self, workspace_id: str, channel_id: str) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(ChannelMembership)
+            .where(
+                ChannelMembership.c.workspace_id == workspace_id,
+                ChannelMembership.c.channel_id == channel_id,
+            )
+        )
+        return (await self.db.execute(stmt)).scalar_one()
+
+    async def get_channel_ids_by_user(self, user_id: str) -> list[str]:
+        stmt = select(ChannelMembership.c.channel_id).where(ChannelMembership.c.user_id == user_id)
+        return (await self.db.execute(stmt)).scalars().all()
+
     async def get_one_by_workspace_channel_user(self, workspace_id: str, channel_id: str, user_id: str):
         stmt = select(ChannelMembership).where(
             ChannelMembership.c.workspace_id == workspace_id,
@@ -39,6 +93,23 @@ class ChannelMembershipRepo:
         )
         await self.db.execute(stmt)
 
+    # Multi-row insert, existing memberships are skipped. Returns the user ids actually inserted.
+    async def bulk_create(self, workspace_id: str, channel_id: str, user_ids: list[str], data: dict) -> list[str]:
+        inserted = []
+        for start in range(0, len(user_ids), BULK_INSERT_CHUNK_SIZE):
+            chunk = user_ids[start : start + BULK_INSERT_CHUNK_SIZE]
+            stmt = (
+                pg_insert(ChannelMembership)
+                .values(
+                    [{"workspace_id": workspace_id, "channel_id": channel_id, "user_id": uid, **data} for uid in chunk]
+                )
+                .on_conflict_do_nothing(index_elements=[ChannelMembership.c.channel_id, ChannelMembership.c.user_id])
+                .returning(ChannelMembership.c.user_id)
+            )
+            result = await self.db.execute(stmt)
+            inserted.extend(result.scalars().all())
+        return inserted
+
     async def update(self, workspace_id: str, channel_id: str, user_id: str, data: dict):
         stmt = (
             update(ChannelMembership)
@@ -51,6 +122,19 @@ class ChannelMembershipRepo:
         )
         await self.db.execute(stmt)
 
+    async def increment_unread_count(self, workspace_id: str, channel_id: str, user_ids: list[str]):
+        # One statement for every member, incremented in place so concurrent messages are all counted
+        stmt = (
+            update(ChannelMembership)
+            .where(
+                ChannelMembership.c.workspace_id == workspace_id,
+                ChannelMembership.c.channel_id == channel_id,
+                ChannelMembership.c.user_id.in_(user_ids),
+            )
+            .values(unread_count=ChannelMembership.c.unread_count + 1)
+        )
+        await self.db.execute(stmt)
+
     async def delete(self, workspace_id: str, channel_id: str, user_id: str):
         stmt = delete(ChannelMembership).where(
             ChannelMembership.c.workspace_id == workspace_id,
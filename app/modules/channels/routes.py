@@ -1,6 +1,7 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, Request, status
 
-from app.core.response import success_response
+from app.core.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.core.response import conditional_response, fast_success_response, success_response, version_etag
 from app.core.schemas import CustomResponse
 from app.modules.channels.deps import (
     ChannelServiceDep,
@@ -11,14 +12,18 @@ from app.modules.channels.deps import (
 from app.modules.channels.schemas import (
     ChannelCreate,
     ChannelCreateRead,
+    ChannelMemberPageRead,
     ChannelMemberRead,
+    ChannelMembersAdd,
+    ChannelMembersAddRead,
     ChannelMembershipRoleUpdate,
     ChannelRead,
     ChannelReadBase,
+    ChannelSidebarRead,
     ChannelTransfer,
     ChannelUpdate,
 )
-from app.modules.workspaces.deps import WSMemberDep
+from app.modules.workspaces.deps import WSAdminDep, WSMemberDep
 
 channel_router = APIRouter(tags=["channels"])
 
@@ -34,6 +39,14 @@ async def get_channels(ws_member: WSMemberDep, channel_service: ChannelServiceDe
     )
 
 
+@channel_router.get("/sidebar", response_model=CustomResponse[list[ChannelSidebarRead]])
+async def get_sidebar(ws_member: WSMemberDep, channel_service: ChannelServiceDep, type: str | None = None):
+    channels = await channel_service.get_sidebar(
+        workspace_id=ws_member.workspace_id, user_id=ws_member.user_id, type=type
+    )
+    return fast_success_response(schema=ChannelSidebarRead, data=channels, message="Sidebar retrieved successfully")
+
+
 @channel_router.get("/search", response_model=CustomResponse[list[ChannelRead]])
 async def search_channels(ws_member: WSMemberDep, channel_service: ChannelServiceDep, query: str):
     channels = await channel_service.search_channels(
@@ -59,15 +72,31 @@ async def create_channel(ws_member: WSMemberDep, channel_service: ChannelService
 
 @channel_router.get("/{channel_id}", response_model=CustomResponse[ChannelRead])
 async def get_channel_by_id(
-    ws_member: WSMemberDep, cn_member: CNMemberDep, channel_service: ChannelServiceDep, channel_id: str
+    request: Request,
+    ws_member: WSMemberDep,
+    cn_member: CNMemberDep,
+    channel_service: ChannelServiceDep,
+    channel_id: str,
 ):
     workspace_id = cn_member.workspace_id if cn_member else ws_member.workspace_id
     channel_id = cn_member.channel_id if cn_member else channel_id
     user_id = cn_member.user_id if cn_member else ws_member.user_id
     channel = await channel_service.get_channel(workspace_id=workspace_id, channel_id=channel_id, user_id=user_id)
-    return success_response(
-        data=ChannelRead.model_validate(channel, from_attributes=True),
-        message="Channel retrieved successfully",
+    membership = channel["membership"]
+    etag = version_etag(
+        channel["id"],
+        channel["updated_at"],
+        membership.updated_at if membership else None,
+        # Member dicts carry the user's updated_at, the role covers membership changes
+        [(member["id"], member["updated_at"], member["role"]) for member in channel["members"]],
+    )
+    return conditional_response(
+        request,
+        lambda: success_response(
+            data=ChannelRead.model_validate(channel, from_attributes=True),
+            message="Channel retrieved successfully",
+        ),
+        etag=etag,
     )
 
 
@@ -128,6 +157,35 @@ async def join_channel(ws_member: WSMemberDep, channel_service: ChannelServiceDe
     return success_response(message="Joined channel successfully")
 
 
+@channel_router.get("/{channel_id}/members", response_model=CustomResponse[ChannelMemberPageRead])
+async def get_channel_members(
+    request: Request,
+    cn_member: CNMemberDep,
+    channel_service: ChannelServiceDep,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+):
+    member_page = await channel_service.get_channel_member_page(
+        workspace_id=cn_member.workspace_id, channel_id=cn_member.channel_id, cursor=cursor, limit=limit
+    )
+    return fast_success_response(
+        schema=ChannelMemberPageRead,
+        data=member_page,
+        message="Channel members retrieved successfully",
+        request=request,
+    )
+
+
+@channel_router.post("/{channel_id}/members", response_model=CustomResponse[ChannelMembersAddRead])
+async def add_channel_members(
+    ws_admin: WSAdminDep, channel_service: ChannelServiceDep, channel_id: str, data: ChannelMembersAdd
+):
+    user_ids = await channel_service.add_channel_members(
+        workspace_id=ws_admin.workspace_id, channel_id=channel_id, data=data
+    )
+    return success_response(data={"user_ids": user_ids}, message="Members added to channel successfully")
+
+
 @channel_router.post("/{channel_id}/leave")
 async def leave_channel(cn_member: CNMemberDep, channel_service: ChannelServiceDep):
     await channel_service.leave_channel(
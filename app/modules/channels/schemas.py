@@ -3,7 +3,7 @@ from enum import Enum
 
 from pydantic import BaseModel
 
-from app.core.schemas import CustomModel
+from app.core.schemas import CustomModel, KeysetPagination
 from app.modules.users.interface import UserRead
 
 
@@ -40,6 +40,11 @@ class ChannelTransfer(BaseModel):
     user_id: str
 
 
+class ChannelMembersAdd(BaseModel):
+    user_ids: list[str] = []
+    all_workspace_members: bool = False
+
+
 class ChannelMembershipCreate(BaseModel):
     role: ChannelMemberRoleEnum
 
@@ -85,5 +90,24 @@ class ChannelRead(ChannelReadBase):
     members: list[ChannelMemberRead]
 
 
+class ChannelSidebarRead(ChannelReadBase):
+    role: ChannelMemberRoleEnum
+    is_starred: bool
+    is_muted: bool
+    unread_count: int
+    last_read_at: datetime | None
+    member_count: int
+    last_activity_at: datetime
+
+
+class ChannelMemberPageRead(CustomModel):
+    members: list[ChannelMemberRead]
+    pagination: KeysetPagination
+
+
 class ChannelCreateRead(BaseModel):
     channel_id: str
+
+
+class ChannelMembersAddRead(BaseModel):
+    user_ids: list[str]
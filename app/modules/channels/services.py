@@ -1,11 +1,12 @@
-from asyncio import gather
 from collections import defaultdict
 from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from app.core.pagination import cursor_page, decode_member_cursor
 from app.core.utils import compute_update_fields_from_dict, generate_channel_id, generate_dm_id
 from app.modules.channels.exceptions import (
+    ChannelBadRequest,
     ChannelMembershipNotFound,
     ChannelMembershipPermissionDenied,
     ChannelNotFound,
@@ -16,6 +17,7 @@ from app.modules.channels.schemas import (
     ChannelCreate,
     ChannelDelete,
     ChannelMemberRoleEnum,
+    ChannelMembersAdd,
     ChannelMembershipRoleUpdate,
     ChannelTransfer,
     ChannelTypeEnum,
@@ -49,8 +51,8 @@ class ChannelService(IChannelService):
         )
 
         user_ids = list({m.user_id for m in memberships})
-        users = await gather(*[self.user_service.get_user_by_id(uid) for uid in user_ids])
-        user_map = {u.id: u for u in users if u}
+        users = await self.user_service.get_users_by_ids(user_ids) if user_ids else []
+        user_map = {u.id: u for u in users}
 
         memberships_by_channel = defaultdict(list)
         membership_by_channel_user = {}
@@ -109,6 +111,24 @@ class ChannelService(IChannelService):
 
         return constructed_channels
 
+    async def get_sidebar(self, workspace_id: str, user_id: str, type: str | None = None):
+        return await self.channel_repo.get_sidebar_list_by_workspace_and_user(
+            workspace_id=workspace_id, user_id=user_id, type=type
+        )
+
+    async def get_channel_member_page(self, workspace_id: str, channel_id: str, cursor: str | None, limit: int):
+        rows = await self.channel_membership_repo.get_member_page(
+            workspace_id=workspace_id,
+            channel_id=channel_id,
+            after=decode_member_cursor(cursor, ChannelMemberRoleEnum),
+            limit=limit + 1,
+        )
+        total = await self.channel_membership_repo.count_by_workspace_and_channel(
+            workspace_id=workspace_id, channel_id=channel_id
+        )
+        members, pagination = cursor_page(rows, limit, total, key=lambda m: (m.role, m.id))
+        return {"members": members, "pagination": pagination}
+
     async def search_channels(self, workspace_id: str, user_id: str, query: str):
         return await self.channel_repo.search_list_by_workspace_and_user_with_query(
             workspace_id=workspace_id, user_id=user_id, query=query
@@ -210,6 +230,11 @@ class ChannelService(IChannelService):
             data={"unread_count": unread_count},
         )
 
+    async def increment_unread_counts(self, workspace_id: str, channel_id: str, user_ids: list[str]):
+        await self.channel_membership_repo.increment_unread_count(
+            workspace_id=workspace_id, channel_id=channel_id, user_ids=user_ids
+        )
+
     async def set_channel_role(self, workspace_id: str, channel_id: str, data: ChannelMembershipRoleUpdate):
         await self.channel_membership_repo.update(
             workspace_id=workspace_id,
@@ -270,6 +295,42 @@ class ChannelService(IChannelService):
             data={"workspace_id": workspace_id, "channel_id": channel_id},
         )
 
+    async def add_channel_members(self, workspace_id: str, channel_id: str, data: ChannelMembersAdd) -> list[str]:
+        channel = await self.channel_repo.get_one_by_workspace_and_id(workspace_id=workspace_id, channel_id=channel_id)
+        if channel is None or channel.deleted_at is not None:
+            raise ChannelNotFound
+        # DMs and Group DMs keep the members they were opened with
+        if channel.type != ChannelTypeEnum.CHANNEL:
+            raise ChannelBadRequest(detail="Members can only be added to channels")
+
+        # Only workspace members can be added to the channel
+        workspace_member_ids = await self.workspace_service.get_workspace_member_ids(workspace_id=workspace_id)
+        if data.all_workspace_members:
+            user_ids = list(workspace_member_ids)
+        else:
+            workspace_member_id_set = set(workspace_member_ids)
+            user_ids = [uid for uid in dict.fromkeys(data.user_ids) if uid in workspace_member_id_set]
+
+        if not user_ids:
+            return []
+
+        added_user_ids = await self.channel_membership_repo.bulk_create(
+            workspace_id=workspace_id,
+            channel_id=channel_id,
+            user_ids=user_ids,
+            data={"role": ChannelMemberRoleEnum.MEMBER},
+        )
+
+        # notify channel members once for the whole batch
+        if added_user_ids:
+            await self.real_time_notification_service.send_to_channel(
+                channel_id=channel_id,
+                event_type=ChannelEventType.CHANNEL_JOIN,
+                data={"workspace_id": workspace_id, "channel_id": channel_id, "user_ids": added_user_ids},
+            )
+
+        return added_user_ids
+
     async def leave_channel(self, workspace_id: str, channel_id: str, user_id: str):
         channel_membership = await self.channel_membership_repo.get_one_by_workspace_channel_user(
             workspace_id=workspace_id, channel_id=channel_id, user_id=user_id
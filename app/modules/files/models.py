@@ -22,6 +22,7 @@ File = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
     Index(None, "workspace_id", "channel_id"),
 )
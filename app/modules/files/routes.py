@@ -1,5 +1,9 @@
-from fastapi import APIRouter, UploadFile
+from typing import Annotated
 
+from fastapi import APIRouter, Depends, UploadFile
+
+from app.core.idempotency import Idempotency, IdempotencyKey
+from app.core.rate_limit import RateLimit
 from app.core.response import success_response
 from app.core.schemas import CustomResponse
 from app.modules.auth.deps import UserDep
@@ -9,10 +13,21 @@ from app.modules.files.schemas import FileCreateRead
 files_router = APIRouter(tags=["files"])
 
 
-@files_router.post("/upload", response_model=CustomResponse[FileCreateRead])
-async def upload_file(user: UserDep, file_service: FileServiceDep, file: UploadFile):
+@files_router.post(
+    "/upload",
+    response_model=CustomResponse[FileCreateRead],
+    dependencies=[Depends(RateLimit("upload_file"))],
+)
+async def upload_file(
+    idempotency: Annotated[IdempotencyKey, Depends(Idempotency("upload_file"))],
+    user: UserDep,
+    file_service: FileServiceDep,
+    file: UploadFile,
+):
     file_id = await file_service.upload_file(user_id=user.id, file=file)
-    return success_response(data=FileCreateRead(file_id=file_id), message="File uploaded successfully")
+    return idempotency.save(
+        success_response(data=FileCreateRead(file_id=file_id), message="File uploaded successfully")
+    )
 
 
 @files_router.delete("/{file_id}", response_model=CustomResponse)
@@ -41,7 +41,6 @@ class FileService(IFileService):
 
     async def update_file(self, file_id: str, data: FileUpdate):
         try:
-            print("data>>>", data)
             return await self.file_repo.update(file_id, data=data.model_dump(exclude_unset=True))
         except Exception as e:
             raise FileBadRequest(detail=str(e))
@@ -0,0 +1,67 @@
+import zlib
+from collections import defaultdict
+from typing import AsyncIterator
+
+import orjson
+
+from app.core.database import async_engine
+from app.modules.messages.repos import MessageMentionRepo, MessageReactionRepo, MessageRepo
+
+EXPORT_PARTITION_SIZE = 500
+
+REACTION_FIELDS = ("id", "emoji", "sender_id", "created_at")
+MENTION_FIELDS = ("id", "user_id", "start_index", "end_index", "mention_text")
+
+
+def _group_by_message(rows, fields: tuple[str, ...]) -> dict[str, list[dict]]:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row.message_id].append({field: getattr(row, field) for field in fields})
+    return grouped
+
+
+# Export runs on its own pooled connection: the stream outlives the request-scoped one.
+async def iter_messages_ndjson(
+    workspace_id: str, channel_ids: list[str] | None = None, compress: bool = False
+) -> AsyncIterator[bytes]:
+    """Yield every message of the workspace (optionally limited to channels) as NDJSON, gzip encoded if asked."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+
+    async with async_engine.connect() as conn:
+        async with conn.begin():
+            message_repo = MessageRepo(conn)
+            message_reaction_repo = MessageReactionRepo(conn)
+            message_mention_repo = MessageMentionRepo(conn)
+
+            async for rows in message_repo.stream_list_by_workspace(
+                workspace_id=workspace_id, channel_ids=channel_ids, partition_size=EXPORT_PARTITION_SIZE
+            ):
+                message_ids = [row.id for row in rows]
+                reactions = _group_by_message(
+                    await message_reaction_repo.get_list_by_message_ids(workspace_id, message_ids), REACTION_FIELDS
+                )
+                mentions = _group_by_message(
+                    await message_mention_repo.get_list_by_message_ids(workspace_id, message_ids), MENTION_FIELDS
+                )
+
+                chunk = b"".join(
+                    orjson.dumps(
+                        {
+                            **row._mapping,
+                            "reactions": reactions.get(row.id, []),
+                            "mentions": mentions.get(row.id, []),
+                        },
+                        # Row keys are SQLAlchemy quoted_name, a str subclass orjson only takes with this option
+                        option=orjson.OPT_NON_STR_KEYS,
+                    )
+                    + b"\n"
+                    for row in rows
+                )
+
+                if compressor:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    yield chunk
+
+    if compressor:
+        yield compressor.flush()
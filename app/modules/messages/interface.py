@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 
 from app.core.schemas import CursorPagination
-from app.modules.messages.schemas import MessageCreate, MessageUpdate, ReactionCreate
+from app.modules.messages.schemas import MessageCreate, MessageExportCreate, MessageUpdate, ReactionCreate
 
 
 class IMessageService(ABC):
@@ -15,6 +15,16 @@ class IMessageService(ABC):
     ):
         pass
 
+    @abstractmethod
+    async def export_messages(
+        self, workspace_id: str, user_id: str, channel_id: str | None = None, compress: bool = False
+    ):
+        pass
+
+    @abstractmethod
+    async def request_messages_export(self, workspace_id: str, user_id: str, data: MessageExportCreate):
+        pass
+
     @abstractmethod
     async def create_message(self, workspace_id: str, channel_id: str, user_id: str, data: MessageCreate):
         pass
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Table, func, text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Table, func, text
 from sqlalchemy.dialects.postgresql import ENUM, JSONB
 
 from app.core.models import metadata
@@ -23,7 +23,10 @@ Message = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
+    # Latest message per channel (sidebar last activity) without scanning the channel
+    Index("messages_channel_id_created_at_idx", "channel_id", "created_at"),
 )
 
 Reactions = Table(
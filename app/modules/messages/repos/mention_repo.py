@@ -13,6 +13,11 @@ class MessageMentionRepo:
         result = await self.db.execute(stmt)
         return result.fetchall()
 
+    async def get_list_by_message_ids(self, workspace_id: str, message_ids: list[str]):
+        stmt = select(Mentions).where(Mentions.c.workspace_id == workspace_id, Mentions.c.message_id.in_(message_ids))
+        result = await self.db.execute(stmt)
+        return result.fetchall()
+
     async def get_one(self, workspace_id: str, message_id: str, mention_id: str):
         stmt = select(Mentions).where(
             Mentions.c.workspace_id == workspace_id,
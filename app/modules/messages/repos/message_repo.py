@@ -15,6 +15,15 @@ class MessageRepo:
         result = await self.db.execute(stmt)
         return result.first()
 
+    async def get_list_by_ids(self, workspace_id: str, channel_id: str, message_ids: list[str]):
+        stmt = select(Message).where(
+            Message.c.workspace_id == workspace_id,
+            Message.c.channel_id == channel_id,
+            Message.c.id.in_(message_ids),
+        )
+        result = await self.db.execute(stmt)
+        return result.fetchall()
+
     async def get_list_by_workspace_with_pagination(
         self,
         workspace_id: str,
@@ -84,6 +93,24 @@ class MessageRepo:
         result = await self.db.execute(stmt)
         return result.fetchall()
 
+    # Server-side cursor, yields the rows in partitions so memory stays bounded
+    async def stream_list_by_workspace(
+        self, workspace_id: str, channel_ids: list[str] | None = None, partition_size: int = 500
+    ):
+        stmt = (
+            select(Message)
+            .where(Message.c.workspace_id == workspace_id)
+            .order_by(Message.c.created_at.asc())
+            .execution_options(yield_per=partition_size)
+        )
+
+        if channel_ids is not None:
+            stmt = stmt.where(Message.c.channel_id.in_(channel_ids))
+
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions(partition_size):
+            yield partition
+
     async def create(self, workspace_id: str, channel_id: str, message_id: str, data: dict):
         stmt = (
             insert(Message)
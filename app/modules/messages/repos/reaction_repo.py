@@ -13,6 +13,13 @@ class MessageReactionRepo:
         result = await self.db.execute(stmt)
         return result.fetchall()
 
+    async def get_list_by_message_ids(self, workspace_id: str, message_ids: list[str]):
+        stmt = select(Reactions).where(
+            Reactions.c.workspace_id == workspace_id, Reactions.c.message_id.in_(message_ids)
+        )
+        result = await self.db.execute(stmt)
+        return result.fetchall()
+
     async def get_one(self, workspace_id: str, message_id: str, reaction_id: str):
         stmt = select(Reactions).where(
             Reactions.c.workspace_id == workspace_id,
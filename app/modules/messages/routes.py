@@ -1,26 +1,53 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Query, status
-
-from app.core.response import success_response
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from app.core.idempotency import Idempotency, IdempotencyKey
+from app.core.rate_limit import RateLimit
+from app.core.response import (
+    conditional_response,
+    fast_success_response,
+    ndjson_stream_response,
+    row_versions,
+    success_response,
+    version_etag,
+)
 from app.core.schemas import CursorPagination, CustomResponse
 from app.modules.channels.deps import CNMemberDep
 from app.modules.messages.deps import MessageServiceDep
 from app.modules.messages.schemas import (
     MessageCreate,
     MessageCreateRead,
+    MessageExportCreate,
+    MessageExportCreateRead,
     MessageRead,
     MessageUpdate,
     ReactionCreate,
     ReactionCreateRead,
 )
-from app.modules.workspaces.deps import WSMemberDep
+from app.modules.workspaces.deps import WSAdminDep, WSMemberDep
 
 message_router = APIRouter(tags=["messages"])
 
 
+def _message_versions(messages: list[dict]) -> list:
+    # Reactions and mentions don't touch the message row, so their ids are part of its version
+    return [
+        (
+            message["id"],
+            message["updated_at"],
+            message["sender"].updated_at if message["sender"] else None,
+            row_versions(message["reactions"]),
+            row_versions(message["mentions"]),
+            _message_versions(message["replies"]),
+        )
+        for message in messages
+    ]
+
+
 @message_router.get("/messages", response_model=CustomResponse[MessageRead])
 async def get_messages_by_workspace(
+    request: Request,
     ws_member: WSMemberDep,
     message_service: MessageServiceDep,
     pagination: Annotated[CursorPagination, Query()],
@@ -28,14 +55,40 @@ async def get_messages_by_workspace(
     messages = await message_service.get_messages_by_workspace(
         workspace_id=ws_member.workspace_id, user_id=ws_member.user_id, pagination=pagination
     )
+    return conditional_response(
+        request,
+        lambda: fast_success_response(schema=MessageRead, data=messages, message="Messages retrieved successfully"),
+        etag=version_etag(pagination, _message_versions(messages)),
+    )
+
+
+@message_router.get("/messages/export")
+async def export_workspace_messages(ws_admin: WSAdminDep, message_service: MessageServiceDep, compress: bool = False):
+    stream = await message_service.export_messages(
+        workspace_id=ws_admin.workspace_id, user_id=ws_admin.user_id, compress=compress
+    )
+    return ndjson_stream_response(stream, filename=f"{ws_admin.workspace_id}.ndjson", compress=compress)
+
+
+@message_router.post(
+    "/messages/export",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=CustomResponse[MessageExportCreateRead],
+)
+async def request_messages_export(ws_admin: WSAdminDep, message_service: MessageServiceDep, data: MessageExportCreate):
+    export_id = await message_service.request_messages_export(
+        workspace_id=ws_admin.workspace_id, user_id=ws_admin.user_id, data=data
+    )
     return success_response(
-        data=[MessageRead.model_validate(message, from_attributes=True) for message in messages],
-        message="Messages retrieved successfully",
+        status_code=status.HTTP_202_ACCEPTED,
+        data={"export_id": export_id},
+        message="Messages export started",
     )
 
 
 @message_router.get("/channels/{channel_id}/messages", response_model=CustomResponse[list[MessageRead]])
 async def get_messages_by_channel(
+    request: Request,
     ws_member: WSMemberDep,
     message_service: MessageServiceDep,
     channel_id: str,
@@ -44,25 +97,48 @@ async def get_messages_by_channel(
     messages = await message_service.get_messages_by_channel(
         workspace_id=ws_member.workspace_id, channel_id=channel_id, pagination=pagination
     )
-    return success_response(
-        data=[MessageRead.model_validate(message, from_attributes=True) for message in messages],
-        message="Messages retrieved successfully",
+    return conditional_response(
+        request,
+        lambda: fast_success_response(schema=MessageRead, data=messages, message="Messages retrieved successfully"),
+        etag=version_etag(pagination, _message_versions(messages)),
     )
 
 
+@message_router.get("/channels/{channel_id}/messages/export")
+async def export_channel_messages(
+    ws_member: WSMemberDep,
+    cn_member: CNMemberDep,
+    message_service: MessageServiceDep,
+    channel_id: str,
+    compress: bool = False,
+):
+    stream = await message_service.export_messages(
+        workspace_id=ws_member.workspace_id, user_id=ws_member.user_id, channel_id=channel_id, compress=compress
+    )
+    return ndjson_stream_response(stream, filename=f"{channel_id}.ndjson", compress=compress)
+
+
 @message_router.post(
     "/channels/{channel_id}/messages",
     status_code=status.HTTP_201_CREATED,
     response_model=CustomResponse[MessageCreateRead],
+    dependencies=[Depends(RateLimit("create_message"))],
 )
-async def create_message(cn_member: CNMemberDep, message_service: MessageServiceDep, data: MessageCreate):
+async def create_message(
+    idempotency: Annotated[IdempotencyKey, Depends(Idempotency("create_message"))],
+    cn_member: CNMemberDep,
+    message_service: MessageServiceDep,
+    data: MessageCreate,
+):
     message_id = await message_service.create_message(
         workspace_id=cn_member.workspace_id, channel_id=cn_member.channel_id, user_id=cn_member.user_id, data=data
     )
-    return success_response(
-        status_code=status.HTTP_201_CREATED,
-        data={"message_id": message_id},
-        message="Message created successfully",
+    return idempotency.save(
+        success_response(
+            status_code=status.HTTP_201_CREATED,
+            data={"message_id": message_id},
+            message="Message created successfully",
+        )
     )
 
 
@@ -92,9 +168,14 @@ async def delete_message():
     "/channels/{channel_id}/messages/{message_id}/reactions",
     status_code=status.HTTP_201_CREATED,
     response_model=CustomResponse[ReactionCreateRead],
+    dependencies=[Depends(RateLimit("create_reaction"))],
 )
 async def create_reaction(
-    cn_member: CNMemberDep, message_service: MessageServiceDep, message_id: str, data: ReactionCreate
+    idempotency: Annotated[IdempotencyKey, Depends(Idempotency("create_reaction"))],
+    cn_member: CNMemberDep,
+    message_service: MessageServiceDep,
+    message_id: str,
+    data: ReactionCreate,
 ):
     reaction_id = await message_service.create_reaction(
         workspace_id=cn_member.workspace_id,
@@ -103,10 +184,12 @@ async def create_reaction(
         user_id=cn_member.user_id,
         data=data,
     )
-    return success_response(
-        status_code=status.HTTP_201_CREATED,
-        data={"reaction_id": reaction_id},
-        message="Reaction created successfully",
+    return idempotency.save(
+        success_response(
+            status_code=status.HTTP_201_CREATED,
+            data={"reaction_id": reaction_id},
+            message="Reaction created successfully",
+        )
     )
 
 
@@ -67,9 +67,30 @@ class MessageRead(MessageReadBase):
     replies: list[MessageReadBase] | None
 
 
+class MessageDelta(CustomModel):
+    """Realtime form of a new message, the sender is resolved from the client's user cache."""
+
+    id: str
+    content: str
+    sender_id: str
+    sender_version: int  # newer than the cached profile -> the client asks for it with users:sync
+    created_at: datetime
+    parent_id: str | None = None
+    message_type: MessageTypeEnum = MessageTypeEnum.MESSAGE_USER
+
+
+class MessageExportCreate(BaseModel):
+    channel_id: str | None = None
+    compress: bool = True
+
+
 class MessageCreateRead(BaseModel):
     message_id: str
 
 
 class ReactionCreateRead(BaseModel):
     reaction_id: str
+
+
+class MessageExportCreateRead(BaseModel):
+    export_id: str
@@ -1,21 +1,25 @@
-from asyncio import gather
+from collections import defaultdict
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.schemas import CursorPagination
-from app.core.utils import generate_short_id
+from app.core.utils import generate_short_id, to_version
 from app.modules.channels.interface import IChannelService
 from app.modules.messages.exceptions import MessageNotFound, MessagePermissionDenied
+from app.modules.messages.export import iter_messages_ndjson
 from app.modules.messages.interface import IMessageService
 from app.modules.messages.repos import MessageMentionRepo, MessageReactionRepo, MessageRepo
 from app.modules.messages.schemas import (
     MessageCreate,
+    MessageDelta,
+    MessageExportCreate,
     MessageRead,
     MessageUpdate,
     ReactionCreate,
     ReactionRead,
 )
-from app.modules.notifications.async_tasks.interface import IAsyncNotificationService
+from app.modules.notifications.async_tasks.interface import IAsyncNotificationService, MessagesExport
 from app.modules.notifications.realtime.interface import (
     ChannelEventType,
     IRealtimeNotificationService,
@@ -24,6 +28,13 @@ from app.modules.notifications.realtime.interface import (
 from app.modules.users.interface import IUserService
 
 
+def _group_by_message(rows) -> dict[str, list]:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row.message_id].append(row)
+    return grouped
+
+
 class MessageService(IMessageService):
     def __init__(
         self,
@@ -120,18 +131,22 @@ class MessageService(IMessageService):
         )
         replies = [dict(row._mapping) for row in reply_rows]
 
-        # Step 3: enrich
-        async def enrich(msg):
-            msg["reactions"] = await self.message_reaction_repo.get_list(
-                workspace_id=workspace_id, message_id=msg["id"]
-            )
-            msg["mentions"] = await self.message_mention_repo.get_list(workspace_id=workspace_id, message_id=msg["id"])
-            msg["sender"] = await self.user_service.get_user_by_id(msg["sender_id"])
+        # Step 3: enrich, one query each for the reactions, mentions and senders of the whole page
+        messages = top_messages + replies
+        message_ids = [msg["id"] for msg in messages]
+        reactions = _group_by_message(
+            await self.message_reaction_repo.get_list_by_message_ids(workspace_id, message_ids)
+        )
+        mentions = _group_by_message(await self.message_mention_repo.get_list_by_message_ids(workspace_id, message_ids))
+        senders = {
+            user.id: user
+            for user in await self.user_service.get_users_by_ids(list({msg["sender_id"] for msg in messages}))
+        }
+        for msg in messages:
+            msg["reactions"] = reactions.get(msg["id"], [])
+            msg["mentions"] = mentions.get(msg["id"], [])
+            msg["sender"] = senders.get(msg["sender_id"])
             msg["replies"] = []
-            return msg
-
-        top_messages = await gather(*(enrich(msg) for msg in top_messages))
-        replies = await gather(*(enrich(msg) for msg in replies))
 
         # Step 4: attach replies
         message_dict = {msg["id"]: msg for msg in top_messages}
@@ -142,6 +157,46 @@ class MessageService(IMessageService):
 
         return top_messages
 
+    async def _get_export_channel_ids(self, workspace_id: str, user_id: str, channel_id: str | None = None):
+        # Same scope as get_messages_by_workspace: being a workspace admin does not open other people's
+        # private channels and DMs
+        channels = await self.channel_service.get_channels(workspace_id=workspace_id, user_id=user_id)
+        channel_ids = [channel["id"] for channel in channels]
+
+        if channel_id is None:
+            return channel_ids
+        if channel_id not in channel_ids:
+            raise MessagePermissionDenied
+        return [channel_id]
+
+    async def export_messages(
+        self, workspace_id: str, user_id: str, channel_id: str | None = None, compress: bool = False
+    ):
+        channel_ids = await self._get_export_channel_ids(
+            workspace_id=workspace_id, user_id=user_id, channel_id=channel_id
+        )
+        return iter_messages_ndjson(workspace_id=workspace_id, channel_ids=channel_ids, compress=compress)
+
+    async def request_messages_export(self, workspace_id: str, user_id: str, data: MessageExportCreate):
+        export_id = generate_short_id(prefix="E")
+        # Resolved now, on the request connection, so the worker exports exactly what the requester could read
+        channel_ids = await self._get_export_channel_ids(
+            workspace_id=workspace_id, user_id=user_id, channel_id=data.channel_id
+        )
+
+        await self.async_notification_service.export_messages(
+            MessagesExport(
+                export_id=export_id,
+                workspace_id=workspace_id,
+                user_id=user_id,
+                channel_id=data.channel_id,
+                channel_ids=channel_ids,
+                compress=data.compress,
+            )
+        )
+
+        return export_id
+
     async def create_message(self, workspace_id: str, channel_id: str, user_id: str, data: MessageCreate):
         message_id = generate_short_id(prefix="M")
 
@@ -185,21 +240,16 @@ class MessageService(IMessageService):
             data={
                 "workspace_id": workspace_id,
                 "channel_id": channel_id,
-                "message": MessageRead.model_validate(message, from_attributes=True).serializable_dict(),
+                "message": self._realtime_message(message),
             },
         )
 
         # Update unread count for offline or left users and notify them
         if offline_or_left_member_ids:
-            await gather(
-                *[
-                    self.channel_service.update_unread_count(
-                        workspace_id=workspace_id,
-                        channel_id=channel_id,
-                        user_id=uid,
-                    )
-                    for uid in offline_or_left_member_ids
-                ]
+            await self.channel_service.increment_unread_counts(
+                workspace_id=workspace_id,
+                channel_id=channel_id,
+                user_ids=list(offline_or_left_member_ids),
             )
             await self.async_notification_service.notify_users_event_type(
                 event_type=UserEventType.MESSAGE_UNREAD,
@@ -212,6 +262,15 @@ class MessageService(IMessageService):
 
         return message_id
 
+    def _realtime_message(self, message: dict) -> dict:
+        if not settings.REALTIME_MESSAGE_DELTAS:
+            return MessageRead.model_validate(message, from_attributes=True).serializable_dict()
+        # A new message has no reactions, mentions or replies yet, so ids plus content are the whole delta
+        delta = MessageDelta.model_validate(
+            {**message, "sender_version": to_version(message["sender"]["updated_at"])}, from_attributes=True
+        )
+        return delta.serializable_dict(exclude_defaults=True)
+
     async def update_message(
         self, workspace_id: str, channel_id: str, message_id: str, user_id: str, data: MessageUpdate
     ):
@@ -244,7 +303,6 @@ class MessageService(IMessageService):
         self, workspace_id: str, channel_id: str, message_id: str, user_id: str, data: ReactionCreate
     ):
         reaction_id = generate_short_id(prefix="MR")
-        print("xxxxxxxxxxxx", reaction_id)
         reaction = await self.message_reaction_repo.create(
             workspace_id=workspace_id,
             message_id=message_id,
@@ -8,6 +8,7 @@ from app.modules.notifications.async_tasks.schemas import (
     EmailResetPassword,
     EmailVerification,
     EmailWorkspaceInvitation,
+    MessagesExport,
 )
 
 
@@ -24,6 +25,14 @@ class IAsyncNotificationService(ABC):
     async def send_email_workspace_invitation(self, data: EmailWorkspaceInvitation):
         pass
 
+    @abstractmethod
+    async def send_email_workspace_invitations(self, data: list[EmailWorkspaceInvitation]):
+        pass
+
+    @abstractmethod
+    async def export_messages(self, data: MessagesExport):
+        pass
+
     @abstractmethod
     async def notify_users_event_type(self, event_type: str, user_ids: set[str], data: dict[str, Any] = None):
         pass
@@ -19,3 +19,12 @@ class EmailWorkspaceInvitation(BaseModel):
     invitation_id: str
     invitee_name: str
     inviter_name: str
+
+
+class MessagesExport(BaseModel):
+    export_id: str
+    workspace_id: str
+    user_id: str
+    channel_id: str | None = None
+    channel_ids: list[str] = []
+    compress: bool = True
@@ -8,13 +8,9 @@ from app.modules.notifications.async_tasks.schemas import (
     EmailResetPassword,
     EmailVerification,
     EmailWorkspaceInvitation,
+    MessagesExport,
 )
-from app.modules.notifications.async_tasks.utils import (
-    generate_invitation_link,
-    generate_reset_password_link,
-    generate_verify_link,
-    render_email_template,
-)
+from app.modules.notifications.async_tasks.utils import generate_reset_password_link, generate_verify_link
 from app.modules.notifications.realtime.interface import UserEventType
 
 
@@ -23,10 +19,13 @@ class AsyncNotificationService(IAsyncNotificationService):
         self.redis = redis
         self.arq_redis = arq_redis
 
+    # Only structured data is enqueued, the worker renders the template
     async def send_email_verification(self, data: EmailVerification):
-        print("send_email_verification")
         verify_link = await generate_verify_link(redis=self.redis, email=data.email)
-        html_content = render_email_template(
+        await self.arq_redis.enqueue_job(
+            "send_template_email_task",
+            email_to=data.email,
+            subject="Verify your email",
             template_name="verify_email.html",
             context={
                 "project_name": settings.PROJECT_NAME,
@@ -34,14 +33,13 @@ class AsyncNotificationService(IAsyncNotificationService):
                 "verify_link": verify_link,
             },
         )
-        await self.arq_redis.enqueue_job(
-            "send_email_task", email_to=data.email, subject="Verify your email", html_content=html_content
-        )
 
     async def send_email_reset_password(self, data: EmailResetPassword):
         reset_password_link = await generate_reset_password_link(redis=self.redis, email=data.email)
-
-        html_content = render_email_template(
+        await self.arq_redis.enqueue_job(
+            "send_template_email_task",
+            email_to=data.email,
+            subject="Reset your password",
             template_name="reset_password.html",
             context={
                 "project_name": settings.PROJECT_NAME,
@@ -49,35 +47,19 @@ class AsyncNotificationService(IAsyncNotificationService):
                 "reset_password_link": reset_password_link,
             },
         )
-        await self.arq_redis.enqueue_job(
-            "send_email_task", email_to=data.email, subject="Reset your password", html_content=html_content
-        )
 
     async def send_email_workspace_invitation(self, data: EmailWorkspaceInvitation):
-        invitation_link = await generate_invitation_link(
-            workspace_id=data.workspace_id,
-            workspace_name=data.workspace_name,
-            type=data.invitation_type,
-            token=data.invitation_id,
-            email=data.email,
-        )
-        html_content = render_email_template(
-            template_name="workspace_invitation.html",
-            context={
-                "project_name": settings.PROJECT_NAME,
-                "workspace_name": data.workspace_name,
-                "invitee_name": data.invitee_name,
-                "inviter_name": data.inviter_name,
-                "invitation_link": invitation_link,
-            },
-        )
+        await self.send_email_workspace_invitations([data])
+
+    # One job for the whole batch, the worker renders and sends over shared SMTP connections
+    async def send_email_workspace_invitations(self, data: list[EmailWorkspaceInvitation]):
         await self.arq_redis.enqueue_job(
-            "send_email_task",
-            email_to=data.email,
-            subject=f"You have been invited to join {data.workspace_name} on {settings.PROJECT_NAME}",
-            html_content=html_content,
+            "send_workspace_invitation_emails_task", invitations=[item.model_dump() for item in data]
         )
 
+    async def export_messages(self, data: MessagesExport):
+        await self.arq_redis.enqueue_job("export_messages_task", **data.model_dump())
+
     async def notify_users_event_type(self, event_type: str, user_ids: set[str], data: dict[str, Any] = None):
         match event_type:
             case UserEventType.MESSAGE_UNREAD:
@@ -1,9 +1,19 @@
 from email.message import EmailMessage
+from typing import Any
 
-import aiosmtplib
 from loguru import logger
 
 from app.core.config import settings
+from app.modules.notifications.async_tasks.utils import generate_invitation_link, render_email_template
+
+
+def build_email_message(email_to: str, subject: str, html_content: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = f"{settings.PROJECT_NAME} <{settings.SMTP_USER}>"
+    message["To"] = email_to
+    message["Subject"] = subject
+    message.set_content(html_content, subtype="html")
+    return message
 
 
 async def send_email_task(
@@ -13,21 +23,58 @@ async def send_email_task(
     subject: str = "",
     html_content: str = "",
 ) -> None:
-    message = EmailMessage()
-    message["From"] = f"{settings.PROJECT_NAME} <{settings.SMTP_USER}>"
-    message["To"] = email_to
-    message["Subject"] = subject
-    message.set_content(html_content, subtype="html")
+    message = build_email_message(email_to, subject, html_content)
 
-    smtp_kwargs = {
-        "hostname": settings.SMTP_HOST,
-        "port": settings.SMTP_PORT,
-        "start_tls": settings.SMTP_TLS,
-        "username": settings.SMTP_USER,
-        "password": settings.SMTP_PASSWORD,
-    }
-    try:
-        await aiosmtplib.send(message, **smtp_kwargs)
+    if await ctx["smtp"].send(message):
         logger.info(f"Send email async success to {email_to}, subject: {subject}")
-    except Exception as e:
-        logger.error(f"Send email async failed to {email_to}: {e}")
+
+
+async def send_template_email_task(
+    ctx,
+    *,
+    email_to: str,
+    subject: str,
+    template_name: str,
+    context: dict[str, Any],
+) -> None:
+    html_content = render_email_template(template_name=template_name, context=context)
+    await send_email_task(ctx, email_to=email_to, subject=subject, html_content=html_content)
+
+
+async def send_email_batch_task(ctx, *, emails: list[dict[str, str]]) -> None:
+    """Send N emails in one job, each item holds `email_to`, `subject` and `html_content`."""
+    messages = [build_email_message(email["email_to"], email["subject"], email["html_content"]) for email in emails]
+    sent = await ctx["smtp"].send_batch(messages)
+    logger.info("Sent {sent}/{total} emails in batch", sent=sent, total=len(messages))
+
+
+async def send_workspace_invitation_emails_task(ctx, *, invitations: list[dict[str, Any]]) -> None:
+    messages = []
+    for invitation in invitations:
+        invitation_link = await generate_invitation_link(
+            workspace_id=invitation["workspace_id"],
+            workspace_name=invitation["workspace_name"],
+            type=invitation["invitation_type"],
+            token=invitation["invitation_id"],
+            email=invitation["email"],
+        )
+        html_content = render_email_template(
+            template_name="workspace_invitation.html",
+            context={
+                "project_name": settings.PROJECT_NAME,
+                "workspace_name": invitation["workspace_name"],
+                "invitee_name": invitation["invitee_name"],
+                "inviter_name": invitation["inviter_name"],
+                "invitation_link": invitation_link,
+            },
+        )
+        messages.append(
+            build_email_message(
+                invitation["email"],
+                f"You have been invited to join {invitation['workspace_name']} on {settings.PROJECT_NAME}",
+                html_content,
+            )
+        )
+
+    sent = await ctx["smtp"].send_batch(messages)
+    logger.info("Sent {sent}/{total} workspace invitation emails", sent=sent, total=len(messages))
@@ -0,0 +1,97 @@
+import asyncio
+
+from loguru import logger
+
+from app.core.config import settings
+from app.modules.files.s3_client import get_s3_client
+from app.modules.messages.export import iter_messages_ndjson
+from app.modules.notifications.realtime.deps import get_real_time_notification_service
+from app.modules.notifications.realtime.interface import UserEventType
+
+S3_MIN_PART_SIZE = 5 * 1024 * 1024  # S3 rejects non-final multipart parts below 5 MiB
+EXPORT_URL_EXPIRES_IN = 24 * 3600
+
+
+async def export_messages_task(
+    ctx,
+    *,
+    export_id: str,
+    workspace_id: str,
+    user_id: str,
+    channel_id: str | None = None,
+    channel_ids: list[str] | None = None,
+    compress: bool = True,
+) -> None:
+    s3_client = await get_s3_client()
+    bucket = settings.AWS_S3_BUCKET_NAME
+    file_key = f"exports/{workspace_id}/{export_id}.ndjson" + (".gz" if compress else "")
+
+    upload = await asyncio.to_thread(
+        s3_client.create_multipart_upload,
+        Bucket=bucket,
+        Key=file_key,
+        ContentType="application/x-ndjson",
+        **({"ContentEncoding": "gzip"} if compress else {}),
+    )
+    upload_id = upload["UploadId"]
+    parts = []
+
+    async def upload_part(body: bytes):
+        part_number = len(parts) + 1
+        result = await asyncio.to_thread(
+            s3_client.upload_part,
+            Bucket=bucket,
+            Key=file_key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        parts.append({"ETag": result["ETag"], "PartNumber": part_number})
+
+    try:
+        buffer = bytearray()
+        async for chunk in iter_messages_ndjson(
+            workspace_id=workspace_id,
+            # Resolved from the requester's memberships when the export was requested, never the whole workspace
+            channel_ids=channel_ids or [],
+            compress=compress,
+        ):
+            buffer += chunk
+            if len(buffer) >= S3_MIN_PART_SIZE:
+                await upload_part(bytes(buffer))
+                buffer.clear()
+
+        if buffer or not parts:
+            await upload_part(bytes(buffer))
+
+        await asyncio.to_thread(
+            s3_client.complete_multipart_upload,
+            Bucket=bucket,
+            Key=file_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception as e:
+        await asyncio.to_thread(s3_client.abort_multipart_upload, Bucket=bucket, Key=file_key, UploadId=upload_id)
+        logger.error(
+            "Messages export {export_id} failed for workspace {workspace_id}: {error}",
+            export_id=export_id,
+            workspace_id=workspace_id,
+            error=e,
+        )
+        return
+
+    url = await asyncio.to_thread(
+        s3_client.generate_presigned_url,
+        "get_object",
+        Params={"Bucket": bucket, "Key": file_key},
+        ExpiresIn=EXPORT_URL_EXPIRES_IN,
+    )
+    logger.info("Messages export {export_id} uploaded to {file_key}", export_id=export_id, file_key=file_key)
+
+    real_time_notification_service = await get_real_time_notification_service()
+    await real_time_notification_service.send_to_user(
+        user_id,
+        event_type=UserEventType.MESSAGES_EXPORT_READY,
+        data={"workspace_id": workspace_id, "channel_id": channel_id, "export_id": export_id, "url": url},
+    )
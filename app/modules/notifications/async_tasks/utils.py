@@ -2,17 +2,30 @@ import uuid
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from redis.asyncio import Redis
 
 from app.core.config import settings
 from app.core.utils import set_redis_value
 
+EMAIL_TEMPLATES_DIR = Path(__file__).parent / "email_templates" / "build"
+
+# Templates never change at runtime: skip the mtime check and keep compiled bytecode across worker restarts
+email_template_env = Environment(
+    loader=FileSystemLoader(EMAIL_TEMPLATES_DIR),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+    cache_size=-1,
+)
+
+
+def precompile_email_templates() -> None:
+    for template_name in email_template_env.list_templates(extensions=["html"]):
+        email_template_env.get_template(template_name)
+
 
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (Path(__file__).parent / "email_templates" / "build" / template_name).read_text()
-    html_content = Template(template_str).render(context)
-    return html_content
+    return email_template_env.get_template(template_name).render(context)
 
 
 async def generate_verify_link(redis: Redis, email: str) -> str:
@@ -0,0 +1,89 @@
+import time
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from typing import Any
+
+import jwt
+from jwt import InvalidTokenError
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.redis import redis_client
+from app.modules.auth.sessions import SessionStore
+from app.modules.channels.repos import ChannelMembershipRepo
+from app.modules.workspaces.repos import WorkspaceMembershipRepo
+
+MEMBERSHIP_CACHE_TTL = 60  # seconds before a user's memberships are reloaded
+MEMBERSHIP_REFRESH_INTERVAL = 5  # min seconds between reloads triggered by an unknown room
+
+
+async def authenticate_socket(environ: dict[str, Any], auth: dict[str, Any] | None) -> str | None:
+    """Return the user id of a valid, unrevoked access token, taken from the auth payload or the access_token cookie."""
+    token = (auth or {}).get("token")
+    if not token:
+        cookie = SimpleCookie(environ.get("HTTP_COOKIE", ""))
+        token = cookie["access_token"].value if "access_token" in cookie else None
+    if not token:
+        return None
+
+    try:
+        payload = jwt.decode(token, settings.ACCESS_SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except InvalidTokenError:
+        return None
+    if payload.get("type") != "access_token" or not payload.get("sub"):
+        return None
+
+    user_id = str(payload["sub"])
+    session_store = SessionStore(redis=redis_client.get_client())
+    if await session_store.is_token_revoked(user_id=user_id, token_version=payload.get("ver", 0)):
+        return None
+    return user_id
+
+
+@dataclass
+class UserMemberships:
+    workspace_ids: set[str] = field(default_factory=set)
+    channel_ids: set[str] = field(default_factory=set)
+    loaded_at: float = 0.0
+
+
+class MembershipCache:
+    """Per-node cache of the workspaces and channels a user belongs to, used to authorize room joins.
+
+    One load (two indexed queries) covers every join of a user until the TTL expires, so reconnect
+    storms don't turn into one membership query per room. A join to a room missing from the cache
+    reloads it (at most every MEMBERSHIP_REFRESH_INTERVAL) to pick up memberships created since.
+    """
+
+    def __init__(self, ttl: float = MEMBERSHIP_CACHE_TTL, refresh_interval: float = MEMBERSHIP_REFRESH_INTERVAL):
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._users: dict[str, UserMemberships] = {}
+
+    async def _load(self, user_id: str) -> UserMemberships:
+        async with async_engine.connect() as conn:
+            workspace_ids = await WorkspaceMembershipRepo(conn).get_workspace_ids_by_user(user_id)
+            channel_ids = await ChannelMembershipRepo(conn).get_channel_ids_by_user(user_id)
+        memberships = UserMemberships(set(workspace_ids), set(channel_ids), time.monotonic())
+        self._users[user_id] = memberships
+        return memberships
+
+    async def get(self, user_id: str, refresh_if_older_than: float | None = None) -> UserMemberships:
+        memberships = self._users.get(user_id)
+        max_age = self.ttl if refresh_if_older_than is None else refresh_if_older_than
+        if memberships is None or time.monotonic() - memberships.loaded_at > max_age:
+            memberships = await self._load(user_id)
+        return memberships
+
+    async def is_member(self, user_id: str, *, workspace_id: str | None = None, channel_id: str | None = None) -> bool:
+        def allowed(memberships: UserMemberships) -> bool:
+            return (workspace_id is None or workspace_id in memberships.workspace_ids) and (
+                channel_id is None or channel_id in memberships.channel_ids
+            )
+
+        if allowed(await self.get(user_id)):
+            return True
+        return allowed(await self.get(user_id, refresh_if_older_than=self.refresh_interval))
+
+    def invalidate(self, user_id: str):
+        self._users.pop(user_id, None)
@@ -4,6 +4,7 @@ class UserEventType:
     MENTION_CREATE = "mention:create"
     CHANNEL_ROLE_UPDATE = "channel:role:update"
     WORKSPACE_REMOVE = "workspace:remove"
+    MESSAGES_EXPORT_READY = "messages:export:ready"
 
 
 class WorkspaceEventType:
@@ -16,6 +17,17 @@ class WorkspaceEventType:
     CHANNEL_CREATE = "channel:create"  # public
 
 
+# Never persisted nor queued, relayed between sockets only
+class EphemeralEventType:
+    TYPING = "channel:typing"
+
+
+# Client requests answered on the same event name, to the requesting socket only
+class SyncEventType:
+    USERS_SYNC = "users:sync"  # sender profiles for the client user cache
+    MESSAGES_FETCH = "messages:fetch"  # full message objects when a delta can't be resolved
+
+
 class ChannelEventType:
     CHANNEL_UPDATE = "channel:update"
     CHANNEL_DELETE = "channel:delete"
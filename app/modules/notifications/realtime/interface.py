@@ -6,6 +6,8 @@ from typing import Any
 
 from app.modules.notifications.realtime.event_type import (  # noqa F401
     ChannelEventType,
+    EphemeralEventType,
+    SyncEventType,
     UserEventType,
     WorkspaceEventType,
 )
@@ -20,6 +22,10 @@ class IRealtimeNotificationService(ABC):
     async def send_to_user(self, user_id: str, event_type: str, data: dict[str, Any]):
         pass
 
+    @abstractmethod
+    async def send_to_users(self, user_ids: set[str], event_type: str, data: dict[str, Any]):
+        pass
+
     @abstractmethod
     async def send_to_workspace(self, workspace_id: str, event_type: str, data: dict[str, Any]):
         pass
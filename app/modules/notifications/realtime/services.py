@@ -11,8 +11,10 @@ class RealtimeNotificationService(IRealtimeNotificationService):
     async def send_to_user(self, user_id: str, event_type: str, data: dict[str, Any]):
         await self._socketio_manager.emit_to_room(f"user_{user_id}", event_type, data)
 
+    async def send_to_users(self, user_ids: set[str], event_type: str, data: dict[str, Any]):
+        await self._socketio_manager.emit_to_rooms([f"user_{user_id}" for user_id in user_ids], event_type, data)
+
     async def send_to_workspace(self, workspace_id: str, event_type: str, data: dict[str, Any]):
-        print("send_to_workspace", workspace_id, event_type, data)
         await self._socketio_manager.emit_to_room(f"workspace_{workspace_id}", event_type, data)
 
     async def send_to_channel(self, channel_id: str, event_type: str, data: dict[str, Any]):
@@ -0,0 +1,217 @@
+import asyncio
+import zlib
+from collections import defaultdict
+
+import socketio
+from loguru import logger
+from redis.exceptions import RedisError
+
+# Rooms created by SocketIOManager. Anything else (sid rooms, broadcasts, control messages) stays on
+# the base channel that every node subscribes to.
+SHARDED_ROOM_PREFIXES = ("user_", "workspace_", "channel_")
+
+
+class ShardedAsyncRedisManager(socketio.AsyncRedisManager):
+    """Redis client manager that spreads room emits over `shards` pub/sub channels.
+
+    An emit to a room is published on `<channel>:<crc32(room) % shards>` and each node only
+    subscribes to the shards of rooms that have local sockets, so a node no longer receives and
+    decodes the traffic of every room in the cluster. Emits to a local sid are not published at all.
+
+    Built on the python-socketio >= 5.17 manager: messages are JSON, like the base class publishes, and
+    the Redis connection is opened lazily by the first publish or by the listener.
+    With `serializer="msgpack"` messages are msgpack encoded instead, and an emit to a list of rooms
+    is split per shard with the event payload packed only once.
+    """
+
+    name = "aioredis-sharded"
+
+    def __init__(self, url: str, shards: int = 64, channel: str = "socketio", serializer: str = "json", **kwargs):
+        self.shards = shards
+        self.serializer = serializer
+        if serializer == "msgpack":
+            import msgpack
+        else:
+            # Still needed to read frames from msgpack nodes while a cluster switches serializers
+            try:
+                import msgpack
+            except ImportError:
+                msgpack = None
+        self._msgpack = msgpack
+        self._warned_undecodable = False
+        self._shard_rooms: dict[int, int] = {}  # shard -> number of local rooms hashing to it
+        self._subscribed_shards: set[int] = set()
+        self._sync_pending = False
+        self._sync_task: asyncio.Task | None = None
+        super().__init__(url=url, channel=channel, **kwargs)
+
+    # --- Routing ---
+
+    def _shard_of(self, room) -> int | None:
+        if self.shards <= 1 or not isinstance(room, str) or not room.startswith(SHARDED_ROOM_PREFIXES):
+            return None
+        return zlib.crc32(room.encode()) % self.shards
+
+    def _shard_channel(self, shard: int) -> str:
+        return f"{self.channel}:{shard}"
+
+    def _route(self, message: dict) -> dict[str, list | str | None]:
+        """Channel -> room(s) to publish the message with on that channel."""
+        room = message.get("room")
+        if message.get("method") != "emit":
+            return {self.channel: room}
+        if isinstance(room, (list, tuple, set)):
+            by_channel = defaultdict(list)
+            for r in room:
+                shard = self._shard_of(r)
+                by_channel[self.channel if shard is None else self._shard_channel(shard)].append(r)
+            return by_channel
+        shard = self._shard_of(room)
+        return {self.channel if shard is None else self._shard_channel(shard): room}
+
+    def _encode(self, data: dict, rooms_by_channel: dict) -> dict[str, str | bytes]:
+        if self.serializer != "msgpack":
+            return {channel: self.json.dumps({**data, "room": room}) for channel, room in rooms_by_channel.items()}
+
+        # Header and payload are packed back to back so the payload is encoded once for every shard
+        header = {key: value for key, value in data.items() if key != "data"}
+        payload = self._msgpack.packb(data.get("data"), default=_msgpack_default)
+        return {
+            channel: self._msgpack.packb({**header, "room": room}, default=_msgpack_default) + payload
+            for channel, room in rooms_by_channel.items()
+        }
+
+    def _decode(self, raw: bytes) -> dict | None:
+        # Frames are decoded by their own format, not this node's serializer, so nodes on either one
+        # understand each other. A JSON message is an object, a msgpack header a map: never a "{" byte.
+        if raw[:1] == b"{":
+            try:
+                return self.json.loads(raw)
+            except ValueError:
+                return None
+        return self._unpack(raw)
+
+    def _unpack(self, raw: bytes) -> dict | None:
+        if self._msgpack is None:
+            if not self._warned_undecodable:
+                logger.warning("Dropping msgpack Socket.IO messages from other nodes, install the msgpack extra")
+                self._warned_undecodable = True
+            return None
+        unpacker = self._msgpack.Unpacker(raw=False)
+        unpacker.feed(raw)
+        try:
+            header = next(unpacker)
+            if isinstance(header, dict) and "method" in header:
+                header["data"] = next(unpacker)
+                return header
+        except (StopIteration, ValueError, self._msgpack.UnpackException):
+            pass
+        return None
+
+    async def _publish(self, data):
+        room = data.get("room")
+        # A sid room lives on exactly one node, and emit() has already delivered it here
+        if data.get("method") == "emit" and isinstance(room, str) and self.is_connected(room, data.get("namespace")):
+            return
+
+        messages = self._encode(data, self._route(data))
+        for retries_left in (1, 0):
+            try:
+                if not self.connected:
+                    self._redis_connect()
+                for channel, message in messages.items():
+                    await self.redis.publish(channel, message)
+                return
+            except RedisError as e:
+                self.connected = False
+                if retries_left:
+                    logger.error("Cannot publish to redis... retrying: {}", e)
+                else:
+                    logger.error("Cannot publish to redis... giving up: {}", e)
+
+    # --- Local room tracking: every room change on this node goes through these two primitives ---
+
+    def basic_enter_room(self, sid, namespace, room, eio_sid=None):
+        is_new_room = room not in self.rooms.get(namespace, {})
+        super().basic_enter_room(sid, namespace, room, eio_sid=eio_sid)
+        shard = self._shard_of(room)
+        if is_new_room and shard is not None:
+            self._shard_rooms[shard] = self._shard_rooms.get(shard, 0) + 1
+            if self._shard_rooms[shard] == 1:
+                self._schedule_subscription_sync()
+
+    def basic_leave_room(self, sid, namespace, room):
+        existed = room in self.rooms.get(namespace, {})
+        super().basic_leave_room(sid, namespace, room)
+        shard = self._shard_of(room)
+        if existed and shard is not None and room not in self.rooms.get(namespace, {}):
+            self._shard_rooms[shard] -= 1
+            if not self._shard_rooms[shard]:
+                del self._shard_rooms[shard]
+                self._schedule_subscription_sync()
+
+    # --- Subscriptions ---
+
+    def _schedule_subscription_sync(self):
+        self._sync_pending = True
+        # Before the listener has connected there is nothing to update, it syncs once subscribed
+        if self.write_only or self.pubsub is None or (self._sync_task and not self._sync_task.done()):
+            return
+        try:
+            self._sync_task = asyncio.get_running_loop().create_task(self._sync_subscriptions())
+        except RuntimeError:
+            pass  # no loop yet, the listener syncs when it starts
+
+    async def _sync_subscriptions(self):
+        # Coalesces bursts of room changes (e.g. join_rooms) into one SUBSCRIBE / UNSUBSCRIBE each
+        while self._sync_pending:
+            self._sync_pending = False
+            wanted = set(self._shard_rooms)
+            subscribe = wanted - self._subscribed_shards
+            unsubscribe = self._subscribed_shards - wanted
+            try:
+                if subscribe:
+                    await self.pubsub.subscribe(*(self._shard_channel(shard) for shard in subscribe))
+                if unsubscribe:
+                    await self.pubsub.unsubscribe(*(self._shard_channel(shard) for shard in unsubscribe))
+            except RedisError as e:
+                # The listener reconnects and resubscribes from scratch
+                logger.error("Socket.IO shard subscription failed: {}", e)
+                return
+            self._subscribed_shards = wanted
+
+    async def _redis_listen_with_retries(self):
+        retry_sleep = 1
+        while True:
+            try:
+                # Every (re)connect starts a new pubsub: the base channel and the local shards are subscribed again
+                self._redis_connect()
+                await self.pubsub.subscribe(self.channel)
+                self._subscribed_shards = set()
+                self._sync_pending = True
+                await self._sync_subscriptions()
+                retry_sleep = 1
+                async for message in self.pubsub.listen():
+                    yield message
+            except RedisError as e:
+                logger.error("Cannot receive from redis... retrying in {} secs: {}", retry_sleep, e)
+                self.connected = False
+                await asyncio.sleep(retry_sleep)
+                retry_sleep = min(retry_sleep * 2, 60)
+
+    async def _listen(self):
+        base_channel = self.channel.encode()
+        shard_prefix = f"{self.channel}:".encode()
+        async for message in self._redis_listen_with_retries():
+            if message["type"] == "message" and (
+                message["channel"] == base_channel or message["channel"].startswith(shard_prefix)
+            ):
+                decoded = self._decode(message["data"])
+                if decoded is not None:
+                    yield decoded
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__} for Socket.IO pub/sub")
@@ -1,11 +1,19 @@
 import socketio
 
 from app.core.config import settings
+from app.modules.notifications.realtime.sharded_manager import ShardedAsyncRedisManager
 
 SOCKET_IO_BACKEND = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_SOCKET_IO_DB}"
-mgr = socketio.AsyncRedisManager(SOCKET_IO_BACKEND)
+USE_MSGPACK = settings.SOCKET_IO_SERIALIZER == "msgpack"
+
+mgr = ShardedAsyncRedisManager(
+    SOCKET_IO_BACKEND,
+    shards=settings.SOCKET_IO_SHARDS,
+    serializer="msgpack" if USE_MSGPACK else "json",
+)
 sio = socketio.AsyncServer(
     async_mode="asgi",
     cors_allowed_origins=settings.all_cors_origins,
     client_manager=mgr,
+    serializer="msgpack" if USE_MSGPACK else "default",
 )
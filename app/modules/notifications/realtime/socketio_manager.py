@@ -1,16 +1,32 @@
+import time
 from typing import Any
 
-from loguru import logger
-
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import SOCKETIO_CONNECTED, SOCKETIO_EMIT_FANOUT, SOCKETIO_ROOMS
+from app.modules.notifications.realtime.auth import MembershipCache, authenticate_socket
+from app.modules.notifications.realtime.event_type import EphemeralEventType, SyncEventType
 from app.modules.notifications.realtime.socketio_app import sio
+from app.modules.notifications.realtime.sync import SYNC_BATCH_LIMIT, load_full_messages, load_workspace_users
 
 
 class SocketIOManager:
     def __init__(self):
-        # Maintain a mapping from sid to user_id, user_id to sids and channel_subscriptions
+        # Maintain a mapping from sid to user_id, user_id to sids and channel subscriptions.
+        # Subscriptions are indexed both ways: sid -> channels so a disconnect only touches the sid's own
+        # channels, and channel -> user -> number of subscribed sids so a user stays online in a channel
+        # until their last tab leaves it.
         self._sid_to_user_id: dict[str, str] = {}
         self._user_id_to_sids: dict[str, set[str]] = {}
-        self._channel_subscriptions: dict[str, set[str]] = {}
+        self._sid_channels: dict[str, set[str]] = {}
+        self._channel_users: dict[str, dict[str, int]] = {}
+        # user -> channel -> (last broadcast time, last broadcast typing state)
+        self._typing_state: dict[str, dict[str, tuple[float, bool]]] = {}
+        self._typing_throttle = settings.TYPING_THROTTLE_MS / 1000
+        self._membership_cache = MembershipCache()
+
+        SOCKETIO_CONNECTED.set_function(lambda: len(self._local_room_members(None)))
+        SOCKETIO_ROOMS.set_function(self._count_local_rooms)
 
     def setup_event_handlers(self):
         """Set up connection and custom event handlers for the Socket.IO server."""
@@ -19,58 +35,55 @@ class SocketIOManager:
         async def connect(sid, environ, auth):
             """
             Handle a new Socket.IO connection.
-            **No rooms are joined automatically.** Clients must send a 'join_user_room' event.
+            The access token (auth["token"] or the access_token cookie) is validated once here and the
+            socket joins its user room. Workspace and channel rooms are joined with explicit events.
             """
-            user_id = auth.get("user_id") if auth else None
+            user_id = await authenticate_socket(environ, auth)
             if not user_id:
-                logger.warning(f"Socket.IO connect: sid={sid} (user_id unknown at connect).")
+                logger.warning(
+                    "Socket.IO connect rejected: sid={sid} (invalid, revoked or missing access token)", sid=sid
+                )
                 return False
 
-            logger.info(f"Socket.IO connect: sid={sid}. Connection established, awaiting join_user_room.")
+            self._sid_to_user_id[sid] = user_id
+            self._user_id_to_sids.setdefault(user_id, set()).add(sid)
+            await sio.enter_room(sid, f"user_{user_id}")
+            logger.info("Socket.IO connect: sid={sid}, user_id={user_id}", sid=sid, user_id=user_id)
 
         @sio.event
         async def disconnect(sid):
             """Handle a Socket.IO disconnection."""
             user_id = self._remove_sid(sid)
-            logger.info(f"Socket.IO disconnect: sid={sid}, user_id={user_id or 'unknown'}")
+            logger.info("Socket.IO disconnect: sid={sid}, user_id={user_id}", sid=sid, user_id=user_id or "unknown")
 
         # --- Custom Events: Client joins/leaves rooms dynamically ---
 
         @sio.event
         async def join_user_room(sid, data: dict[str, Any]):
-            """Client requests to join a user-specific room. Should be the first event sent after connecting."""
-            user_id = data.get("user_id")
-            if not user_id:
-                logger.warning(f"Invalid join_user_room request from {sid}: Missing user_id.")
-                await sio.emit(
-                    "room_join_ack",
-                    {"status": "failure", "message": "Missing user_id"},
-                    room=sid,
-                )
+            """Kept for older clients: the user room is joined at connect, only the authenticated user's is allowed."""
+            user_id = self._sid_to_user_id.get(sid)
+            if not user_id or data.get("user_id", user_id) != user_id:
+                logger.warning("Invalid join_user_room request from {sid}", sid=sid)
+                await sio.emit("room_join_ack", {"status": "failure", "message": "Forbidden"}, room=sid)
                 return
 
             room_name = f"user_{user_id}"
             await sio.enter_room(sid, room_name)
-
-            self._sid_to_user_id[sid] = user_id
-            self._user_id_to_sids.setdefault(user_id, set()).add(sid)
-
-            logger.info(f"Socket {sid} (user_id={user_id}) joined user room: {room_name}")
             await sio.emit("room_join_ack", {"room_name": room_name, "status": "success"}, room=sid)
 
         @sio.event
         async def leave_user_room(sid, data: dict[str, Any]):
             """Client requests to leave a user-specific room (usually not necessary unless switching accounts)."""
-            user_id = data.get("user_id")
+            user_id = self._sid_to_user_id.get(sid)
             if not user_id:
-                logger.warning(f"Invalid leave_user_room request from {sid}: Missing user_id.")
+                logger.warning("Invalid leave_user_room request from {sid}: unknown socket", sid=sid)
                 return
 
             room_name = f"user_{user_id}"
             await sio.leave_room(sid, room_name)
 
             self._remove_sid(sid)
-            logger.info(f"Socket {sid} (user_id={user_id}) left user room: {room_name}")
+            logger.info("Socket {sid} (user_id={user_id}) left user room", sid=sid, user_id=user_id)
             await sio.emit(
                 "room_leave_ack",
                 {"room_name": room_name, "status": "success"},
@@ -84,7 +97,7 @@ class SocketIOManager:
             workspace_id = data.get("workspace_id")
 
             if not user_id or not workspace_id:
-                logger.warning(f"Invalid join_workspace_room request from {sid}: user_id={user_id}, data={data}")
+                logger.warning("Invalid join_workspace_room request from {sid}", sid=sid)
                 await sio.emit(
                     "room_join_ack",
                     {"status": "failure", "message": "Missing user_id or workspace_id"},
@@ -92,9 +105,13 @@ class SocketIOManager:
                 )
                 return
 
+            if not await self._membership_cache.is_member(user_id, workspace_id=workspace_id):
+                await sio.emit("room_join_ack", {"status": "failure", "message": "Forbidden"}, room=sid)
+                return
+
             room_name = f"workspace_{workspace_id}"
             await sio.enter_room(sid, room_name)
-            logger.info(f"Socket {sid} (user_id={user_id}) joined workspace room: {room_name}")
+            logger.debug("Socket {sid} joined {room}", sid=sid, room=room_name)
             await sio.emit("room_join_ack", {"room_name": room_name, "status": "success"}, room=sid)
 
         @sio.event
@@ -103,12 +120,12 @@ class SocketIOManager:
             user_id = self._sid_to_user_id.get(sid)
             workspace_id = data.get("workspace_id")
             if not user_id or not workspace_id:
-                logger.warning(f"Invalid leave_workspace_room request from {sid}: {data}")
+                logger.warning("Invalid leave_workspace_room request from {sid}", sid=sid)
                 return
 
             room_name = f"workspace_{workspace_id}"
             await sio.leave_room(sid, room_name)
-            logger.info(f"Socket {sid} (user_id={user_id}) left workspace room: {room_name}")
+            logger.debug("Socket {sid} left {room}", sid=sid, room=room_name)
             await sio.emit(
                 "room_leave_ack",
                 {"room_name": room_name, "status": "success"},
@@ -123,7 +140,7 @@ class SocketIOManager:
             workspace_id = data.get("workspace_id")
 
             if not user_id or not channel_id or not workspace_id:
-                logger.warning(f"Invalid join_channel_room request from {sid}: data={data}")
+                logger.warning("Invalid join_channel_room request from {sid}", sid=sid)
                 await sio.emit(
                     "room_join_ack",
                     {"status": "failure", "message": "Missing required IDs"},
@@ -131,42 +148,138 @@ class SocketIOManager:
                 )
                 return
 
-            room_name = f"channel_{channel_id}"
-            await sio.enter_room(sid, room_name)
-
-            # Add the user to channel_subscriptions
-            if channel_id not in self._channel_subscriptions:
-                self._channel_subscriptions[channel_id] = set()
-            self._channel_subscriptions[channel_id].add(user_id)
+            if not await self._membership_cache.is_member(user_id, workspace_id=workspace_id, channel_id=channel_id):
+                await sio.emit("room_join_ack", {"status": "failure", "message": "Forbidden"}, room=sid)
+                return
 
-            logger.info(f"Socket {sid} (user_id={user_id}) joined channel room: {room_name}")
+            room_name = await self._join_channel(sid, user_id, channel_id)
             await sio.emit("room_join_ack", {"room_name": room_name, "status": "success"}, room=sid)
 
+        @sio.event
+        async def join_rooms(sid, data: dict[str, Any]):
+            """Join many workspace and channel rooms in one round trip, e.g. every channel after a reconnect."""
+            user_id = self._sid_to_user_id.get(sid)
+            if not user_id:
+                await sio.emit("rooms_join_ack", {"status": "failure", "message": "Unknown socket"}, room=sid)
+                return
+
+            memberships = await self._membership_cache.get(user_id)
+            workspace_ids = set(data.get("workspace_ids") or [])
+            channel_ids = set(data.get("channel_ids") or [])
+            # One reload at most for the whole batch when it asks for rooms the cache doesn't know
+            if not (workspace_ids <= memberships.workspace_ids and channel_ids <= memberships.channel_ids):
+                memberships = await self._membership_cache.get(
+                    user_id, refresh_if_older_than=self._membership_cache.refresh_interval
+                )
+
+            joined, denied = [], []
+            for workspace_id in workspace_ids:
+                if workspace_id in memberships.workspace_ids:
+                    room_name = f"workspace_{workspace_id}"
+                    await sio.enter_room(sid, room_name)
+                    joined.append(room_name)
+                else:
+                    denied.append(f"workspace_{workspace_id}")
+            for channel_id in channel_ids:
+                if channel_id in memberships.channel_ids:
+                    joined.append(await self._join_channel(sid, user_id, channel_id))
+                else:
+                    denied.append(f"channel_{channel_id}")
+
+            await sio.emit(
+                "rooms_join_ack",
+                {"status": "success", "joined": joined, "denied": denied},
+                room=sid,
+            )
+
+        @sio.on(EphemeralEventType.TYPING)
+        async def typing(sid, data: dict[str, Any]):
+            """Relay a typing indicator to the channel, memory only: no database, no job queue."""
+            user_id = self._sid_to_user_id.get(sid)
+            channel_id = data.get("channel_id")
+            # Only sockets subscribed to the channel may signal in it
+            if not user_id or channel_id not in self._sid_channels.get(sid, ()):
+                return
+
+            is_typing = bool(data.get("is_typing", True))
+            now = time.monotonic()
+            channels = self._typing_state.setdefault(user_id, {})
+            last_sent_at, last_is_typing = channels.get(channel_id, (0.0, False))
+            # Drop repeats within the window (every tab of the user shares it), a state change always goes out
+            if is_typing == last_is_typing and now - last_sent_at < self._typing_throttle:
+                return
+            if not is_typing and not last_is_typing:
+                return
+            channels[channel_id] = (now, is_typing)
+
+            await sio.emit(
+                EphemeralEventType.TYPING,
+                {"channel_id": channel_id, "user_id": user_id, "is_typing": is_typing},
+                room=f"channel_{channel_id}",
+                skip_sid=list(self._user_id_to_sids.get(user_id, (sid,))),
+            )
+
+        @sio.on(SyncEventType.USERS_SYNC)
+        async def users_sync(sid, data: dict[str, Any]):
+            """Send the profiles the client's user cache is missing or holds a stale version of."""
+            user_id = self._sid_to_user_id.get(sid)
+            workspace_id = data.get("workspace_id")
+            user_ids = list(dict.fromkeys(data.get("user_ids") or []))[:SYNC_BATCH_LIMIT]
+            if not user_id or not workspace_id or not user_ids:
+                return
+            if not await self._membership_cache.is_member(user_id, workspace_id=workspace_id):
+                return
+
+            users = await load_workspace_users(workspace_id, user_ids)
+            await sio.emit(SyncEventType.USERS_SYNC, {"workspace_id": workspace_id, "users": users}, room=sid)
+
+        @sio.on(SyncEventType.MESSAGES_FETCH)
+        async def messages_fetch(sid, data: dict[str, Any]):
+            """Fallback to full message objects, e.g. for clients without a user cache."""
+            user_id = self._sid_to_user_id.get(sid)
+            workspace_id = data.get("workspace_id")
+            channel_id = data.get("channel_id")
+            message_ids = list(dict.fromkeys(data.get("message_ids") or []))[:SYNC_BATCH_LIMIT]
+            if not user_id or not workspace_id or not channel_id or not message_ids:
+                return
+            if not await self._membership_cache.is_member(user_id, workspace_id=workspace_id, channel_id=channel_id):
+                return
+
+            messages = await load_full_messages(workspace_id, channel_id, message_ids)
+            await sio.emit(
+                SyncEventType.MESSAGES_FETCH,
+                {"workspace_id": workspace_id, "channel_id": channel_id, "messages": messages},
+                room=sid,
+            )
+
         @sio.event
         async def leave_channel_room(sid, data: dict[str, Any]):
             """Client requests to leave a channel room."""
             user_id = self._sid_to_user_id.get(sid)
             channel_id = data.get("channel_id")
             if not user_id or not channel_id:
-                logger.warning(f"Invalid leave_channel_room request from {sid}: {data}")
+                logger.warning("Invalid leave_channel_room request from {sid}", sid=sid)
                 return
 
             room_name = f"channel_{channel_id}"
             await sio.leave_room(sid, room_name)
 
-            # Remove the user from channel_subscriptions
-            if channel_id in self._channel_subscriptions:
-                self._channel_subscriptions[channel_id].discard(user_id)
-                if not self._channel_subscriptions[channel_id]:
-                    del self._channel_subscriptions[channel_id]
+            self._unsubscribe(sid, user_id, channel_id)
 
-            logger.info(f"Socket {sid} (user_id={user_id}) left channel room: {room_name}")
+            logger.debug("Socket {sid} left {room}", sid=sid, room=room_name)
             await sio.emit(
                 "room_leave_ack",
                 {"room_name": room_name, "status": "success"},
                 room=sid,
             )
 
+    async def _join_channel(self, sid: str, user_id: str, channel_id: str) -> str:
+        room_name = f"channel_{channel_id}"
+        await sio.enter_room(sid, room_name)
+        self._subscribe(sid, user_id, channel_id)
+        logger.debug("Socket {sid} joined {room}", sid=sid, room=room_name)
+        return room_name
+
     # --- Methods to emit messages to specific rooms (unchanged) ---
     def _remove_sid(self, sid: str):
         user_id = self._sid_to_user_id.pop(sid, None)
@@ -176,34 +289,93 @@ class SocketIOManager:
                 sids.discard(sid)
                 if not sids:
                     self._user_id_to_sids.pop(user_id, None)
-
-            # Remove the user from channel_subscriptions
-            for channel_id in self._channel_subscriptions:
-                self._channel_subscriptions[channel_id].discard(user_id)
-                if not self._channel_subscriptions[channel_id]:
-                    del self._channel_subscriptions[channel_id]
+                    self._membership_cache.invalidate(user_id)
+                    self._typing_state.pop(user_id, None)
+
+            for channel_id in self._sid_channels.pop(sid, ()):
+                self._release_channel_user(channel_id, user_id)
+        return user_id
+
+    def _subscribe(self, sid: str, user_id: str, channel_id: str):
+        channels = self._sid_channels.setdefault(sid, set())
+        if channel_id in channels:
+            return
+        channels.add(channel_id)
+        users = self._channel_users.setdefault(channel_id, {})
+        users[user_id] = users.get(user_id, 0) + 1
+
+    def _unsubscribe(self, sid: str, user_id: str, channel_id: str):
+        channels = self._sid_channels.get(sid)
+        if not channels or channel_id not in channels:
+            return
+        channels.discard(channel_id)
+        if not channels:
+            del self._sid_channels[sid]
+        self._release_channel_user(channel_id, user_id)
+
+    def _release_channel_user(self, channel_id: str, user_id: str):
+        users = self._channel_users.get(channel_id)
+        if not users or user_id not in users:
+            return
+        users[user_id] -= 1
+        if not users[user_id]:
+            del users[user_id]
+            if not users:
+                del self._channel_users[channel_id]
+
+    # Rooms as seen by this node's client manager: {room: {sid: eio_sid}}, room None holds every sid
+    def _local_room_members(self, room_name: str | None):
+        return sio.manager.rooms.get("/", {}).get(room_name, {})
+
+    def _count_local_rooms(self) -> int:
+        rooms = sio.manager.rooms.get("/", {})
+        # Every socket also sits in a private room named after its sid
+        return len(rooms) - len(rooms.get(None, {})) - (None in rooms)
 
     async def emit_to_room(self, room_name: str, event_type: str, data: dict[str, Any]):
         """Generic method to emit an event to a specific Socket.IO room."""
+        SOCKETIO_EMIT_FANOUT.labels(event_type=event_type).observe(len(self._local_room_members(room_name)))
         try:
             await sio.emit(event_type, data, room=room_name)
-            logger.debug(f"Emitted Socket.IO event '{event_type}' to room '{room_name}'. Data: {data}")
+            logger.debug(
+                "Emitted Socket.IO event {event_type} to room {room_name}", event_type=event_type, room_name=room_name
+            )
+        except Exception as e:
+            logger.opt(exception=e).error(
+                "Error emitting Socket.IO event {event_type} to room {room_name}",
+                event_type=event_type,
+                room_name=room_name,
+            )
+
+    async def emit_to_rooms(self, room_names: list[str], event_type: str, data: dict[str, Any]):
+        """Emit one event to several rooms, the packet is encoded once and each socket gets it once."""
+        if not room_names:
+            return
+        SOCKETIO_EMIT_FANOUT.labels(event_type=event_type).observe(
+            sum(len(self._local_room_members(room_name)) for room_name in room_names)
+        )
+        try:
+            await sio.emit(event_type, data, room=room_names)
+            logger.debug(
+                "Emitted Socket.IO event {event_type} to {count} rooms", event_type=event_type, count=len(room_names)
+            )
         except Exception as e:
-            logger.error(
-                f"Error emitting Socket.IO event '{event_type}' to room '{room_name}': {e}",
-                exc_info=True,
+            logger.opt(exception=e).error(
+                "Error emitting Socket.IO event {event_type} to {count} rooms",
+                event_type=event_type,
+                count=len(room_names),
             )
 
     def get_online_users_in_channel(self, channel_id: str):
-        return self._channel_subscriptions.get(channel_id, set())
+        return set(self._channel_users.get(channel_id, ()))
 
     async def broadcast(self, event_type: str, data: dict[str, Any]):
         """Broadcast an event to all active connections."""
         try:
             await sio.emit(event_type, data)
-            logger.info(f"Broadcasted Socket.IO event '{event_type}'. Data: {data}")
+            logger.info("Broadcasted Socket.IO event {event}", event=event_type)
         except Exception as e:
-            logger.error(f"Error broadcasting Socket.IO event '{event_type}': {e}", exc_info=True)
+            logger.opt(exception=e).error("Error broadcasting Socket.IO event {event}", event=event_type)
 
 
 # Global Socket.IO manager instance
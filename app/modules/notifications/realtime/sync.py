@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+from app.core.database import async_engine
+from app.core.utils import to_version
+from app.modules.messages.repos import MessageMentionRepo, MessageReactionRepo, MessageRepo
+from app.modules.messages.schemas import MessageRead
+from app.modules.users.interface import UserBaseRead
+from app.modules.users.repos import UserRepo
+from app.modules.workspaces.repos import WorkspaceMembershipRepo
+
+SYNC_BATCH_LIMIT = 200  # ids resolved per users:sync / messages:fetch request
+
+
+def user_sync_dict(user) -> dict:
+    """Profile sent to the client user cache, `version` tells it whether a cached copy is stale."""
+    return {
+        **UserBaseRead.model_validate(user, from_attributes=True).serializable_dict(),
+        "version": to_version(user.updated_at),
+    }
+
+
+async def load_workspace_users(workspace_id: str, user_ids: list[str]) -> list[dict]:
+    """Profiles of the given users that belong to the workspace, others are silently dropped."""
+    async with async_engine.connect() as conn:
+        member_ids = await WorkspaceMembershipRepo(conn).get_user_ids_by_workspace_and_users(workspace_id, user_ids)
+        if not member_ids:
+            return []
+        users = await UserRepo(conn).get_list_by_ids(member_ids)
+    return [user_sync_dict(user) for user in users]
+
+
+async def load_full_messages(workspace_id: str, channel_id: str, message_ids: list[str]) -> list[dict]:
+    """Full message objects (sender, reactions, mentions) for clients that can't resolve a delta."""
+    async with async_engine.connect() as conn:
+        messages = [
+            dict(row._mapping) for row in await MessageRepo(conn).get_list_by_ids(workspace_id, channel_id, message_ids)
+        ]
+        if not messages:
+            return []
+        ids = [message["id"] for message in messages]
+        reactions = await MessageReactionRepo(conn).get_list_by_message_ids(workspace_id, ids)
+        mentions = await MessageMentionRepo(conn).get_list_by_message_ids(workspace_id, ids)
+        senders = await UserRepo(conn).get_list_by_ids(list({message["sender_id"] for message in messages}))
+
+    senders_by_id = {sender.id: sender for sender in senders}
+    reactions_by_message, mentions_by_message = defaultdict(list), defaultdict(list)
+    for reaction in reactions:
+        reactions_by_message[reaction.message_id].append(reaction)
+    for mention in mentions:
+        mentions_by_message[mention.message_id].append(mention)
+
+    for message in messages:
+        message["sender"] = senders_by_id.get(message["sender_id"])
+        message["reactions"] = reactions_by_message[message["id"]]
+        message["mentions"] = mentions_by_message[message["id"]]
+        message["replies"] = []
+    return [MessageRead.model_validate(message, from_attributes=True).serializable_dict() for message in messages]
@@ -32,6 +32,10 @@ class IUserService(ABC):
     async def create_user(self, data: UserDBCreate):
         pass
 
+    @abstractmethod
+    async def create_users(self, data: list[UserDBCreate]):
+        pass
+
     @abstractmethod
     async def update_user(self, user_id: str, data: UserDBUpdate):
         pass
@@ -44,10 +48,18 @@ class IUserService(ABC):
     async def authenticate_user(self, email: EmailStr, password: str):
         pass
 
+    @abstractmethod
+    def decode_token(self, token: str, secret_key: str) -> dict:
+        pass
+
     @abstractmethod
     async def get_user_from_token(self, token: str, secret_key: str):
         pass
 
+    @abstractmethod
+    async def get_user_from_payload(self, payload: dict):
+        pass
+
     @abstractmethod
     async def delete_user(self, user_id: str):
         pass
@@ -28,6 +28,7 @@ User = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
     Index(None, "email", "full_name"),
 )
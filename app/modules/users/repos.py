@@ -1,9 +1,13 @@
 from pydantic import EmailStr
 from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from app.modules.users.models import User
 
+# asyncpg caps a statement at 32767 bind parameters
+BULK_INSERT_CHUNK_SIZE = 1000
+
 
 class UserRepo:
     def __init__(self, db: AsyncConnection):
@@ -29,6 +33,19 @@ class UserRepo:
         stmt = insert(User).values(id=user_id, **data)
         await self.db.execute(stmt)
 
+    # Multi-row insert, emails that already exist are skipped. Returns (id, email) of inserted rows.
+    async def bulk_create(self, rows: list[dict]):
+        inserted = []
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            stmt = (
+                pg_insert(User)
+                .values(rows[start : start + BULK_INSERT_CHUNK_SIZE])
+                .on_conflict_do_nothing(index_elements=[User.c.email])
+                .returning(User.c.id, User.c.email)
+            )
+            inserted.extend((await self.db.execute(stmt)).fetchall())
+        return inserted
+
     async def update(self, user_id: str, data: dict):
         stmt = update(User).where(User.c.id == user_id).values(**data).returning(User)
         result = await self.db.execute(stmt)
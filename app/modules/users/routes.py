@@ -1,8 +1,8 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, UploadFile
+from fastapi import APIRouter, Request, UploadFile
 
-from app.core.response import success_response
+from app.core.response import conditional_response, success_response, version_etag
 from app.core.schemas import CustomResponse
 from app.modules.auth.deps import SuperUserDep, UserDep
 from app.modules.users.deps import UserServiceDep
@@ -13,10 +13,15 @@ user_router = APIRouter(tags=["users"])
 
 
 @user_router.get("/me", response_model=CustomResponse[UserRead])
-async def read_me(user: UserDep):
-    return success_response(
-        data=UserRead.model_validate(user, from_attributes=True),
-        message="User retrieved successfully",
+async def read_me(request: Request, user: UserDep):
+    return conditional_response(
+        request,
+        lambda: success_response(
+            data=UserRead.model_validate(user, from_attributes=True),
+            message="User retrieved successfully",
+        ),
+        etag=version_etag(user.id, user.updated_at),
+        last_modified=user.updated_at,
     )
 
 
@@ -62,6 +62,26 @@ class UserService(IUserService):
         except IntegrityError as e:
             raise UserEmailValidationError("Email already exists") from e
 
+    async def create_users(self, data: list[UserDBCreate]) -> dict[str, str]:
+        """Create users in one statement, returns email -> user id (existing users included)."""
+        if not data:
+            return {}
+
+        rows = [{"id": generate_short_id(prefix="U"), **item.model_dump()} for item in data]
+        try:
+            inserted = await self.user_repo.bulk_create(rows)
+        except IntegrityError as e:
+            logger.exception("Failed to create users")
+            raise UserBadRequest(detail="Could not create users") from e
+
+        user_ids = {row.email: row.id for row in inserted}
+        # Emails created concurrently by another request were skipped by ON CONFLICT
+        missing = [item.email for item in data if item.email not in user_ids]
+        if missing:
+            user_ids.update({u.email: u.id for u in await self.get_users_by_emails(missing)})
+
+        return user_ids
+
     async def update_user(self, user_id: str, data: UserDBUpdate) -> Row:
         user = await self.get_user_by_id(user_id)
         if not user:
@@ -97,20 +117,25 @@ class UserService(IUserService):
 
         return user
 
-    async def get_user_from_token(self, token: str, secret_key: str) -> Row:
+    def decode_token(self, token: str, secret_key: str) -> dict:
         try:
             payload = jwt.decode(
                 token,
                 secret_key,
                 algorithms=[settings.ALGORITHM],
             )
-            user_id = str(payload.get("sub"))
-            if not user_id:
+            if not payload.get("sub"):
                 raise UserInvalidCredentials
         except (DecodeError, ExpiredSignatureError, InvalidTokenError):
             raise UserInvalidCredentials
+        return payload
+
+    async def get_user_from_token(self, token: str, secret_key: str) -> Row:
+        payload = self.decode_token(token=token, secret_key=secret_key)
+        return await self.get_user_from_payload(payload=payload)
 
-        user = await self.get_user_by_id(user_id=user_id)
+    async def get_user_from_payload(self, payload: dict) -> Row:
+        user = await self.get_user_by_id(user_id=str(payload["sub"]))
 
         if not user:
             raise UserInvalidCredentials
@@ -0,0 +1,22 @@
+from app.modules.channels.interface import IChannelService
+from app.modules.workspaces.interface import IWorkspaceService
+
+
+async def load_bootstrap(
+    user, workspace_id: str, workspace_service: IWorkspaceService, channel_service: IChannelService
+) -> dict:
+    """Everything a client needs to render a workspace on cold start, message pages excluded.
+
+    Runs on the request's connection: the parts are queried one after another, but a cold start holds a single
+    pooled connection like any other request, behind the same load shedding.
+    """
+    workspaces = await workspace_service.get_workspaces_by_user(user_id=user.id)
+    member_count = await workspace_service.count_workspace_members(workspace_id=workspace_id)
+    channels = await channel_service.get_sidebar(workspace_id=workspace_id, user_id=user.id)
+    return {
+        "user": user,
+        "workspaces": workspaces,
+        "workspace_id": workspace_id,
+        "member_count": member_count,
+        "channels": channels,
+    }
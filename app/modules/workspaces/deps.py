@@ -76,7 +76,6 @@ def get_ws_member_with_roles(required_roles: list[str]) -> Callable:
         workspace_membership = await workspace_service.get_workspace_membership(
             workspace_id=workspace_id, user_id=user.id
         )
-        print("workspace_membership", workspace_membership)
         if workspace_membership is None:
             raise WSMembershipNotFound
 
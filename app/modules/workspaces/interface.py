@@ -24,10 +24,22 @@ class IWorkspaceService(ABC):
     async def get_workspace(self, workspace_id: str, user_id: str):
         pass
 
+    @abstractmethod
+    async def get_workspace_member_page(self, workspace_id: str, cursor: str | None, limit: int):
+        pass
+
+    @abstractmethod
+    async def count_workspace_members(self, workspace_id: str) -> int:
+        pass
+
     @abstractmethod
     async def get_workspace_membership(self, workspace_id: str, user_id: str):
         pass
 
+    @abstractmethod
+    async def get_workspace_member_ids(self, workspace_id: str):
+        pass
+
     @abstractmethod
     async def update_workspace(self, workspace_id: str, data: WorkspaceUpdate):
         pass
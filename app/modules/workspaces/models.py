@@ -39,6 +39,7 @@ Workspace = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
 )
 
@@ -73,9 +74,12 @@ WorkspaceMembership = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
     Index(None, "user_id", unique=True, postgresql_where=text("is_active = true")),
     Index(None, "workspace_id", unique=True, postgresql_where=text("role = 'owner'")),
+    # Keyset pagination of members in role order
+    Index("workspace_memberships_workspace_id_role_user_id_idx", "workspace_id", "role", "user_id"),
 )
 
 InvitationStatus = ENUM("pending", "accepted", "declined", name="invitation_status", create_type=True)
@@ -114,6 +118,7 @@ WorkspaceInvitation = Table(
         nullable=False,
         server_default=func.now(),
         server_onupdate=func.now(),
+        onupdate=func.now(),
     ),
     Index(None, "workspace_id", "invitee_id"),
     UniqueConstraint("workspace_id", "invitee_id"),
@@ -1,8 +1,12 @@
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from app.modules.workspaces.models import WorkspaceInvitation
 
+# asyncpg caps a statement at 32767 bind parameters
+BULK_INSERT_CHUNK_SIZE = 1000
+
 
 class WorkspaceInvitationRepo:
     def __init__(self, db: AsyncConnection):
@@ -23,6 +27,22 @@ class WorkspaceInvitationRepo:
         stmt = insert(WorkspaceInvitation).values(id=invitation_id, **data)
         await self.db.execute(stmt)
 
+    # A re-invite replaces the previous invitation of the same invitee (new id, so old links stop working)
+    async def bulk_upsert(self, rows: list[dict]):
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            stmt = pg_insert(WorkspaceInvitation).values(rows[start : start + BULK_INSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[WorkspaceInvitation.c.workspace_id, WorkspaceInvitation.c.invitee_id],
+                set_={
+                    "id": stmt.excluded.id,
+                    "inviter_id": stmt.excluded.inviter_id,
+                    "status": "pending",
+                    "created_at": func.now(),
+                    "updated_at": func.now(),
+                },
+            )
+            await self.db.execute(stmt)
+
     async def update(self, workspace_invitation_id: str, data: dict):
         stmt = (
             update(WorkspaceInvitation)
@@ -1,6 +1,7 @@
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, literal, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from app.modules.users.models import User
 from app.modules.workspaces.models import WorkspaceMembership
 from app.modules.workspaces.schemas import WorkspaceMemberRoleEnum
 
@@ -13,6 +14,10 @@ class WorkspaceMembershipRepo:
         stmt = select(WorkspaceMembership).where(WorkspaceMembership.c.user_id == user_id)
         return (await self.db.execute(stmt)).fetchall()
 
+    async def get_workspace_ids_by_user(self, user_id: str) -> list[str]:
+        stmt = select(WorkspaceMembership.c.workspace_id).where(WorkspaceMembership.c.user_id == user_id)
+        return (await self.db.execute(stmt)).scalars().all()
+
     async def count_owned_by_user(self, user_id: str):
         stmt = select(WorkspaceMembership).where(
             WorkspaceMembership.c.user_id == user_id,
@@ -28,6 +33,50 @@ class WorkspaceMembershipRepo:
         stmt = select(WorkspaceMembership).where(WorkspaceMembership.c.workspace_id == workspace_id)
         return (await self.db.execute(stmt)).fetchall()
 
+    async def get_member_page(self, workspace_id: str, after: tuple[str, str] | None, limit: int):
+        """Members joined with their user row, keyset ordered by (role, user_id) off the composite index."""
+        stmt = (
+            select(
+                User.c.id,
+                User.c.email,
+                User.c.full_name,
+                User.c.avatar,
+                User.c.status,
+                User.c.is_active,
+                User.c.updated_at,
+                WorkspaceMembership.c.role,
+            )
+            .select_from(WorkspaceMembership.join(User, User.c.id == WorkspaceMembership.c.user_id))
+            .where(WorkspaceMembership.c.workspace_id == workspace_id)
+            .order_by(WorkspaceMembership.c.role, WorkspaceMembership.c.user_id)
+            .limit(limit)
+        )
+        if after:
+            role, user_id = after
+            stmt = stmt.where(
+                tuple_(WorkspaceMembership.c.role, WorkspaceMembership.c.user_id)
+                > tuple_(literal(role, WorkspaceMembership.c.role.type), literal(user_id))
+            )
+        return (await self.db.execute(stmt)).fetchall()
+
+    async def count_by_workspace(self, workspace_id: str) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(WorkspaceMembership)
+            .where(WorkspaceMembership.c.workspace_id == workspace_id)
+        )
+        return (await self.db.execute(stmt)).scalar_one()
+
+    async def get_user_ids_by_workspace(self, workspace_id: str):
+        stmt = select(WorkspaceMembership.c.user_id).where(WorkspaceMembership.c.workspace_id == workspace_id)
+        return (await self.db.execute(stmt)).scalars().all()
+
+    async def get_user_ids_by_workspace_and_users(self, workspace_id: str, user_ids: list[str]) -> list[str]:
+        stmt = select(WorkspaceMembership.c.user_id).where(
+            WorkspaceMembership.c.workspace_id == workspace_id, WorkspaceMembership.c.user_id.in_(user_ids)
+        )
+        return (await self.db.execute(stmt)).scalars().all()
+
     async def get_active_one_by_user(self, user_id: str):
         stmt = select(WorkspaceMembership).where(
             WorkspaceMembership.c.user_id == user_id,
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, status
+from typing import Annotated
 
-from app.core.response import success_response
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from app.core.idempotency import Idempotency, IdempotencyKey
+from app.core.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.core.response import conditional_response, fast_success_response, success_response, version_etag
 from app.core.schemas import CustomResponse
 from app.modules.auth.deps import UserDep
+from app.modules.channels.deps import ChannelServiceDep
+from app.modules.workspaces.bootstrap import load_bootstrap
 from app.modules.workspaces.deps import (
     WorkspaceServiceDep,
     WSAdminDep,
@@ -10,11 +16,13 @@ from app.modules.workspaces.deps import (
     WSOwnerDep,
 )
 from app.modules.workspaces.schemas import (
+    WorkspaceBootstrapRead,
     WorkspaceCreate,
     WorkspaceCreateRead,
     WorkspaceDetailRead,
     WorkspaceInvite,
     WorkspaceJoin,
+    WorkspaceMemberPageRead,
     WorkspaceMembershipRoleUpdate,
     WorkspaceRead,
     WorkspaceReadBase,
@@ -64,13 +72,61 @@ async def choose_workspace(
 
 @workspace_router.get("/{workspace_id}", response_model=CustomResponse[WorkspaceDetailRead])
 async def get_workspace(
+    request: Request,
     ws_member: WSMemberDep,
     workspace_service: WorkspaceServiceDep,
 ):
     worksapce = await workspace_service.get_workspace(workspace_id=ws_member.workspace_id, user_id=ws_member.user_id)
-    return success_response(
-        data=WorkspaceDetailRead.model_validate(worksapce, from_attributes=True),
-        message="Workspace retrieved successfully",
+    etag = version_etag(
+        worksapce["id"],
+        worksapce["updated_at"],
+        worksapce["membership"].updated_at,
+        worksapce["member_count"],
+        [(member.id, member.updated_at, member.role) for member in worksapce["members"]],
+    )
+    return conditional_response(
+        request,
+        lambda: success_response(
+            data=WorkspaceDetailRead.model_validate(worksapce, from_attributes=True),
+            message="Workspace retrieved successfully",
+        ),
+        etag=etag,
+    )
+
+
+@workspace_router.get("/{workspace_id}/bootstrap", response_model=CustomResponse[WorkspaceBootstrapRead])
+async def bootstrap_workspace(
+    request: Request,
+    user: UserDep,
+    ws_member: WSMemberDep,
+    workspace_service: WorkspaceServiceDep,
+    channel_service: ChannelServiceDep,
+):
+    """Cold start snapshot: the user, their workspaces and this workspace's sidebar in one round trip."""
+    snapshot = await load_bootstrap(
+        user, ws_member.workspace_id, workspace_service=workspace_service, channel_service=channel_service
+    )
+    return fast_success_response(
+        schema=WorkspaceBootstrapRead, data=snapshot, message="Workspace snapshot retrieved", request=request
+    )
+
+
+@workspace_router.get("/{workspace_id}/members", response_model=CustomResponse[WorkspaceMemberPageRead])
+async def get_workspace_members(
+    request: Request,
+    ws_member: WSMemberDep,
+    workspace_service: WorkspaceServiceDep,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+):
+    member_page = await workspace_service.get_workspace_member_page(
+        workspace_id=ws_member.workspace_id, cursor=cursor, limit=limit
+    )
+    return fast_success_response(
+        schema=WorkspaceMemberPageRead,
+        data=member_page,
+        message="Workspace members retrieved successfully",
+        request=request,
     )
 
 
@@ -122,14 +178,17 @@ async def switch_workspace(
     response_model=CustomResponse,
 )
 async def invite_to_workspace(
+    idempotency: Annotated[IdempotencyKey, Depends(Idempotency("invite_to_workspace"))],
     ws_admin: WSAdminDep,
     workspace_service: WorkspaceServiceDep,
     data: WorkspaceInvite,
 ):
     await workspace_service.invite_to_workspace(workspace_id=ws_admin.workspace_id, user_id=ws_admin.user_id, data=data)
-    return success_response(
-        status_code=status.HTTP_202_ACCEPTED,
-        message="Workspace invitation sent successfully",
+    return idempotency.save(
+        success_response(
+            status_code=status.HTTP_202_ACCEPTED,
+            message="Workspace invitation sent successfully",
+        )
     )
 
 
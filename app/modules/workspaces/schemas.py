@@ -3,9 +3,10 @@ from enum import Enum
 
 from pydantic import BaseModel, EmailStr, field_validator
 
-from app.core.schemas import CustomModel
+from app.core.schemas import CustomModel, KeysetPagination
 from app.modules.auth.interface import RegisterBase
-from app.modules.users.interface import UserBaseRead
+from app.modules.channels.interface import ChannelSidebarRead
+from app.modules.users.interface import UserBaseRead, UserRead
 
 
 # Workspace Membership
@@ -119,7 +120,23 @@ class WorkspaceRead(WorkspaceReadBase):
 
 
 class WorkspaceDetailRead(WorkspaceRead):
+    # First page of members, the rest through GET /workspaces/{id}/members?cursor=...
     members: list[WorkspaceMemberRead]
+    member_count: int
+    members_next_cursor: str | None
+
+
+class WorkspaceMemberPageRead(CustomModel):
+    members: list[WorkspaceMemberRead]
+    pagination: KeysetPagination
+
+
+class WorkspaceBootstrapRead(CustomModel):
+    user: UserRead
+    workspaces: list[WorkspaceRead]
+    workspace_id: str
+    member_count: int
+    channels: list[ChannelSidebarRead]
 
 
 class WorkspaceCreateRead(BaseModel):
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, timezone
 from slugify import slugify
 
 from app.core.config import settings
+from app.core.pagination import DEFAULT_PAGE_LIMIT, cursor_page, decode_member_cursor
 from app.core.utils import compute_update_fields_from_dict, generate_short_id, get_password_hash
 from app.modules.files.interface import FileUpdate, IFileService
 from app.modules.notifications.async_tasks.interface import EmailWorkspaceInvitation, IAsyncNotificationService
@@ -104,29 +105,30 @@ class WorkspaceService(IWorkspaceService):
         w = dict(workspace._mapping)
         w["membership"] = membership
 
-        all_memberships = await self.workspace_membership_repo.get_one_by_workspace(workspace_id)
-        user_ids = list({m.user_id for m in all_memberships})
-        users = await self.user_service.get_users_by_ids(user_ids)
-        user_map = {u.id: dict(u._mapping) for u in users}
-
-        role_priority = {"owner": 0, "admin": 1, "member": 2}
-        workspace_members_map = []
-        for m in all_memberships:
-            user = user_map.get(m.user_id)
-            if user:
-                member = {
-                    **user,
-                    "role": m.role,
-                }
-                workspace_members_map.append(member)
-
-        workspace_members_map.sort(key=lambda m: role_priority.get(m["role"], 99))
-        w["members"] = workspace_members_map
+        # Only the first page of members, the rest is paged through get_workspace_member_page
+        member_page = await self.get_workspace_member_page(workspace_id, cursor=None, limit=DEFAULT_PAGE_LIMIT)
+        w["members"] = member_page["members"]
+        w["member_count"] = member_page["pagination"]["total"]
+        w["members_next_cursor"] = member_page["pagination"]["next_cursor"]
         return w
 
+    async def get_workspace_member_page(self, workspace_id: str, cursor: str | None, limit: int):
+        rows = await self.workspace_membership_repo.get_member_page(
+            workspace_id, after=decode_member_cursor(cursor, WorkspaceMemberRoleEnum), limit=limit + 1
+        )
+        total = await self.workspace_membership_repo.count_by_workspace(workspace_id)
+        members, pagination = cursor_page(rows, limit, total, key=lambda m: (m.role, m.id))
+        return {"members": members, "pagination": pagination}
+
+    async def count_workspace_members(self, workspace_id: str) -> int:
+        return await self.workspace_membership_repo.count_by_workspace(workspace_id)
+
     async def get_workspace_membership(self, workspace_id: str, user_id: str):
         return await self.workspace_membership_repo.get_one_by_workspace_and_user(workspace_id, user_id)
 
+    async def get_workspace_member_ids(self, workspace_id: str) -> list[str]:
+        return await self.workspace_membership_repo.get_user_ids_by_workspace(workspace_id)
+
     async def update_workspace(self, workspace_id: str, data: WorkspaceUpdate):
         old = await self.workspace_repo.get_one_by_id(workspace_id)
         update_data = compute_update_fields_from_dict(old=old, new_data=data.model_dump(), include_none_fields=["logo"])
@@ -192,20 +194,24 @@ class WorkspaceService(IWorkspaceService):
             raise WSNotFound
 
         inviter = await self.user_service.get_user_by_id(user_id)
-        email_set = set(data.emails)
-        users = await self.user_service.get_users_by_emails(list(email_set))
+        emails = list(dict.fromkeys(data.emails))
+        users = await self.user_service.get_users_by_emails(emails)
         user_map = {u.email: u for u in users}
+        member_ids = set(await self.workspace_membership_repo.get_user_ids_by_workspace(workspace_id))
+
+        # Placeholder accounts for unknown emails, created in one statement
+        new_user_ids = await self.user_service.create_users(
+            [
+                UserDBCreate(email=email, full_name=email, hashed_password=None)
+                for email in emails
+                if email not in user_map
+            ]
+        )
 
-        memberships = await self.workspace_membership_repo.get_one_by_workspace(workspace_id)
-        member_ids = {m.user_id for m in memberships}
-
-        invitee_ids = [u.id for u in users]
-        invitations = await self.workspace_invitation_repo.get_list_by_workspace_and_invitees(workspace_id, invitee_ids)
-        invitation_map = {inv.invitee_id: inv for inv in invitations}
-
-        for email in data.emails:
+        invitation_rows = []
+        email_invitations = []
+        for email in emails:
             invitee = user_map.get(email)
-            invitee_id = None
             invitee_name = email
             invitation_type = "join"
 
@@ -218,36 +224,40 @@ class WorkspaceService(IWorkspaceService):
                 if not invitee.hashed_password:
                     invitation_type = "rookie"
             else:
-                invitee_id = await self.user_service.create_user(
-                    UserDBCreate(email=email, full_name=email, hashed_password=None)
-                )
+                invitee_id = new_user_ids[email]
                 invitation_type = "rookie"
 
-            if invitee_id in invitation_map:
-                await self.workspace_invitation_repo.delete(invitation_map[invitee_id].id)
-
             invitation_id = generate_short_id("WI")
-            await self.workspace_invitation_repo.create(
-                invitation_id=invitation_id,
-                data=WorkspaceInvitationDBCreate(
+            invitation_rows.append(
+                {
+                    "id": invitation_id,
+                    **WorkspaceInvitationDBCreate(
+                        workspace_id=workspace_id,
+                        inviter_id=user_id,
+                        invitee_id=invitee_id,
+                    ).model_dump(),
+                }
+            )
+            email_invitations.append(
+                EmailWorkspaceInvitation(
                     workspace_id=workspace_id,
-                    inviter_id=user_id,
-                    invitee_id=invitee_id,
-                ).model_dump(),
+                    workspace_name=workspace.name,
+                    email=email,
+                    invitation_type=invitation_type,
+                    invitation_id=invitation_id,
+                    invitee_name=invitee_name,
+                    inviter_name=inviter.full_name,
+                )
             )
 
-            if settings.SMTP_ENABLED:
-                await self.async_notification_service.send_email_workspace_invitation(
-                    EmailWorkspaceInvitation(
-                        workspace_id=workspace_id,
-                        workspace_name=workspace.name,
-                        email=email,
-                        invitation_type=invitation_type,
-                        invitation_id=invitation_id,
-                        invitee_name=invitee_name,
-                        inviter_name=inviter.full_name,
-                    )
-                )
+        if not invitation_rows:
+            return
+
+        # Replaces any previous invitation of the same invitees
+        await self.workspace_invitation_repo.bulk_upsert(invitation_rows)
+
+        if settings.SMTP_ENABLED:
+            await self.async_notification_service.send_email_workspace_invitations(email_invitations)
 
     async def join_workspace(self, workspace_id: str, data: WorkspaceJoin):
         user = await self.user_service.get_user_by_email(data.email)
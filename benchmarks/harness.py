@@ -0,0 +1,264 @@
+"""End-to-end benchmark: seed synthetic data, serve the app in-process and drive the hot paths.
+
+Scenarios: create_message, get_messages_by_channel, get_channels over HTTP, and Socket.IO
+fan-out (time from POST to delivery on every socket joined to the channel). Needs the local
+Postgres and Redis from docker-compose, migrated to head. Results are written as JSON so runs
+can be compared between commits.
+
+Usage: uv run python -m benchmarks.harness --requests 500 --concurrency 20 --socket-clients 20
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+import socketio
+import uvicorn
+
+from app.core.config import settings
+from app.modules.auth.utils import generate_token
+from benchmarks.seed import SeededWorkspace, add_scale_arguments, scale_from_args, seed_fresh
+
+RESULTS_DIR = Path(__file__).parent / "results"
+MESSAGE_CREATE_EVENT = "message:create"
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> ScenarioResult:
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return ScenarioResult(
+        requests=len(latencies) + errors,
+        errors=errors,
+        duration_s=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 2) if duration else 0.0,
+        p50_ms=round(p50 * 1000, 3),
+        p95_ms=round(p95 * 1000, 3),
+        p99_ms=round(p99 * 1000, 3),
+        max_ms=round(max(latencies, default=0.0) * 1000, 3),
+    )
+
+
+async def run_scenario(
+    requests: int, concurrency: int, call: Callable[[int], Awaitable[httpx.Response]]
+) -> ScenarioResult:
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started_at = time.perf_counter()
+            try:
+                response = await call(i)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - started_at)
+
+
+def access_token(user_id: str) -> str:
+    token, _ = generate_token(
+        "access_token",
+        secret_key=settings.ACCESS_SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+        expires_minutes=60,
+        user_id=user_id,
+    )
+    return token
+
+
+class Harness:
+    def __init__(self, base_url: str, workspace: SeededWorkspace, rng: random.Random):
+        self.base_url = base_url
+        self.api_url = f"{base_url}{settings.API_V1_STR}/workspaces/{workspace.id}"
+        self.workspace = workspace
+        self.rng = rng
+        self.channel_ids = list(workspace.channels)
+        self.clients: dict[str, httpx.AsyncClient] = {}
+
+    def client(self, user_id: str) -> httpx.AsyncClient:
+        if user_id not in self.clients:
+            self.clients[user_id] = httpx.AsyncClient(cookies={"access_token": access_token(user_id)}, timeout=30)
+        return self.clients[user_id]
+
+    def pick_member(self) -> tuple[str, str]:
+        channel_id = self.rng.choice(self.channel_ids)
+        return channel_id, self.rng.choice(self.workspace.channels[channel_id])
+
+    async def create_message(self, i: int) -> httpx.Response:
+        channel_id, user_id = self.pick_member()
+        return await self.client(user_id).post(
+            f"{self.api_url}/channels/{channel_id}/messages", json={"content": f"bench create {i}"}
+        )
+
+    async def get_messages_by_channel(self, i: int) -> httpx.Response:
+        channel_id, user_id = self.pick_member()
+        return await self.client(user_id).get(f"{self.api_url}/channels/{channel_id}/messages", params={"limit": 50})
+
+    async def get_channels(self, i: int) -> httpx.Response:
+        _, user_id = self.pick_member()
+        return await self.client(user_id).get(f"{self.api_url}/channels")
+
+    async def socket_fanout(self, messages: int, socket_clients: int) -> ScenarioResult:
+        """Post messages to one channel and time their delivery to every joined socket."""
+        channel_id = self.channel_ids[0]
+        members = self.workspace.channels[channel_id]
+        sender_id = members[0]
+        listeners = [members[i % len(members)] for i in range(socket_clients)]
+
+        sent_at: dict[str, float] = {}
+        # The event can land before the POST response, so arrivals are matched to send times at the end
+        arrivals: list[tuple[str, float]] = []
+        expected = messages * len(listeners)
+        all_delivered = asyncio.Event()
+
+        async def on_message(data):
+            arrivals.append((data["message"]["id"], time.perf_counter()))
+            if len(arrivals) >= expected:
+                all_delivered.set()
+
+        sockets = []
+        for user_id in listeners:
+            sio = socketio.AsyncClient()
+            sio.on(MESSAGE_CREATE_EVENT, on_message)
+            await sio.connect(self.base_url, auth={"token": access_token(user_id)}, transports=["websocket"])
+            await sio.emit("join_channel_room", {"workspace_id": self.workspace.id, "channel_id": channel_id})
+            sockets.append(sio)
+        await asyncio.sleep(0.5)  # let the room joins land before the first emit
+
+        started_at = time.perf_counter()
+        for i in range(messages):
+            request_started_at = time.perf_counter()
+            response = await self.client(sender_id).post(
+                f"{self.api_url}/channels/{channel_id}/messages", json={"content": f"bench fanout {i}"}
+            )
+            if response.is_success:
+                sent_at[response.json()["data"]["message_id"]] = request_started_at
+
+        try:
+            await asyncio.wait_for(all_delivered.wait(), timeout=30)
+        except asyncio.TimeoutError:
+            pass
+        duration = time.perf_counter() - started_at
+
+        for sio in sockets:
+            await sio.disconnect()
+
+        latencies = [arrived_at - sent_at[message_id] for message_id, arrived_at in arrivals if message_id in sent_at]
+        # Failed posts and deliveries that never arrived both count as errors
+        return summarize(latencies, expected - len(latencies), duration)
+
+    async def close(self):
+        for client in self.clients.values():
+            await client.aclose()
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    scale = scale_from_args(args)
+    workspaces = await seed_fresh(scale)
+
+    # The server runs in this process and shares its settings. With the limiter on, a scenario driven by one
+    # user measures 429s rather than the route
+    settings.RATE_LIMIT_ENABLED = args.rate_limit
+    server = uvicorn.Server(uvicorn.Config("app.main:app", host="127.0.0.1", port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    harness = Harness(f"http://127.0.0.1:{args.port}", workspaces[0], random.Random(scale.seed))
+    scenarios = {}
+    try:
+        for name in ("create_message", "get_messages_by_channel", "get_channels"):
+            await run_scenario(args.warmup, args.concurrency, getattr(harness, name))
+            scenarios[name] = asdict(await run_scenario(args.requests, args.concurrency, getattr(harness, name)))
+        if args.socket_clients:
+            scenarios["socket_fanout"] = asdict(await harness.socket_fanout(args.fanout_messages, args.socket_clients))
+    finally:
+        await harness.close()
+        server.should_exit = True
+        await server_task
+
+    return {
+        "git_revision": git_revision(),
+        "started_at": datetime.now(tz=timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "scale": asdict(scale),
+        "load": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "socket_clients": args.socket_clients,
+            "fanout_messages": args.fanout_messages,
+        },
+        "settings": {"rate_limit_enabled": settings.RATE_LIMIT_ENABLED},
+        "scenarios": scenarios,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_scale_arguments(parser)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--socket-clients", type=int, default=20)
+    parser.add_argument("--fanout-messages", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate-limit", action="store_true", help="Keep the per-user rate limiter on")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{results['git_revision'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    for name, result in results["scenarios"].items():
+        print(
+            f"{name:>24}: {result['throughput_rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f} ms  "
+            f"p95 {result['p95_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  errors {result['errors']}"
+        )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare the pydantic response path with the precompiled orjson path for message pages.
+
+Usage: uv run python -m benchmarks.message_serialization
+"""
+
+import timeit
+from datetime import datetime, timezone
+
+from app.core.response import fast_success_response, success_response
+from app.modules.messages.schemas import MessageRead
+
+MESSAGES = 100
+REPLIES_PER_MESSAGE = 10
+ROUNDS = 50
+
+
+def build_sender(index: int) -> dict:
+    now = datetime.now(tz=timezone.utc)
+    return {
+        "id": f"U{index:010d}",
+        "email": f"user{index}@example.com",
+        "full_name": f"User {index}",
+        "avatar": None,
+        "status": None,
+        "is_active": True,
+        "is_verified": True,
+        "last_login_at": now,
+        "created_at": now,
+        "updated_at": now,
+        "hashed_password": "not-serialized",
+    }
+
+
+def build_message(index: int, parent_id: str | None = None) -> dict:
+    now = datetime.now(tz=timezone.utc)
+    message_id = f"M{index:010d}"
+    return {
+        "id": message_id,
+        "content": f"Message body {index} " * 8,
+        "is_pinned": False,
+        "workspace_id": "W0000000001",
+        "channel_id": "C0000000001",
+        "parent_id": parent_id,
+        "sender_id": f"U{index % 20:010d}",
+        "sender": build_sender(index % 20),
+        "created_at": now,
+        "updated_at": now,
+        "reactions": [{"id": f"MR{index}{i}", "emoji": ":+1:", "sender_id": "U0000000001"} for i in range(3)],
+        "mentions": [],
+        "message_type": "message_user",
+        "replies": [],
+    }
+
+
+def build_page() -> list[dict]:
+    page = []
+    for i in range(MESSAGES):
+        message = build_message(i)
+        message["replies"] = [
+            build_message(MESSAGES + i * REPLIES_PER_MESSAGE + j, parent_id=message["id"])
+            for j in range(REPLIES_PER_MESSAGE)
+        ]
+        page.append(message)
+    return page
+
+
+def pydantic_path(page: list[dict]) -> bytes:
+    return success_response(
+        data=[MessageRead.model_validate(message, from_attributes=True) for message in page],
+        message="Messages retrieved successfully",
+    ).body
+
+
+def fast_path(page: list[dict]) -> bytes:
+    return fast_success_response(schema=MessageRead, data=page, message="Messages retrieved successfully").body
+
+
+def main():
+    page = build_page()
+    fast_path(page)  # compile serializers once
+
+    for name, func in (("pydantic", pydantic_path), ("orjson", fast_path)):
+        seconds = min(timeit.repeat(lambda: func(page), number=ROUNDS, repeat=3)) / ROUNDS
+        size = len(func(page))
+        print(f"{name:>10}: {seconds * 1000:8.2f} ms/page  {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
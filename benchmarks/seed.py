@@ -0,0 +1,163 @@
+"""Seed synthetic workspaces, channels, members and messages for the benchmark harness.
+
+Every seeded row is tagged (ids start with `BENCH`, emails end with `@bench.example.com`) so a run
+can be wiped with `reset()` without touching real data.
+
+Usage: uv run python -m benchmarks.seed --workspaces 2 --members 50 --channels 20 --messages 200
+"""
+
+import argparse
+import asyncio
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.database import async_engine
+from app.modules.channels.models import Channel, ChannelMembership
+from app.modules.messages.models import Message
+from app.modules.users.models import User
+from app.modules.workspaces.models import Workspace, WorkspaceMembership
+
+ID_PREFIX = "BENCH"
+EMAIL_DOMAIN = "bench.example.com"  # not .local: EmailStr rejects special-use domains
+INSERT_CHUNK_SIZE = 1000  # asyncpg caps a statement at 32767 bind parameters
+
+
+@dataclass
+class Scale:
+    workspaces: int = 1
+    members: int = 50  # per workspace
+    channels: int = 20  # per workspace
+    channel_members: int = 25  # per channel
+    messages: int = 200  # per channel
+    seed: int = 42
+
+
+@dataclass
+class SeededWorkspace:
+    id: str
+    user_ids: list[str] = field(default_factory=list)
+    # channel id -> member user ids, the first one owns the channel
+    channels: dict[str, list[str]] = field(default_factory=dict)
+
+
+def _id(kind: str, *parts: int) -> str:
+    return f"{ID_PREFIX}{kind}" + "_".join(str(part) for part in parts)
+
+
+async def _insert(conn: AsyncConnection, table, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await conn.execute(pg_insert(table).values(rows[start : start + INSERT_CHUNK_SIZE]).on_conflict_do_nothing())
+
+
+async def reset(conn: AsyncConnection):
+    """Delete everything a previous run seeded, child rows go with the workspace/user cascades."""
+    await conn.execute(delete(Workspace).where(Workspace.c.id.startswith(ID_PREFIX)))
+    await conn.execute(delete(User).where(User.c.email.endswith(f"@{EMAIL_DOMAIN}")))
+
+
+async def seed(conn: AsyncConnection, scale: Scale) -> list[SeededWorkspace]:
+    rng = random.Random(scale.seed)
+    now = datetime.now(tz=timezone.utc)
+    workspaces = []
+
+    for w in range(scale.workspaces):
+        workspace = SeededWorkspace(id=_id("W", w))
+        workspace.user_ids = [_id("U", w, u) for u in range(scale.members)]
+
+        await _insert(conn, Workspace, [{"id": workspace.id, "name": workspace.id, "slug": workspace.id.lower()}])
+        await _insert(
+            conn,
+            User,
+            [
+                {
+                    "id": user_id,
+                    "email": f"{user_id.lower()}@{EMAIL_DOMAIN}",
+                    "full_name": f"Bench User {w}-{u}",
+                    "is_active": True,
+                    "is_verified": True,
+                }
+                for u, user_id in enumerate(workspace.user_ids)
+            ],
+        )
+        await _insert(
+            conn,
+            WorkspaceMembership,
+            [
+                {
+                    "workspace_id": workspace.id,
+                    "user_id": user_id,
+                    "role": "owner" if u == 0 else "member",
+                    # Users only belong to one bench workspace, so it can be their active one
+                    "is_active": True,
+                }
+                for u, user_id in enumerate(workspace.user_ids)
+            ],
+        )
+
+        channel_rows, membership_rows, message_rows = [], [], []
+        for c in range(scale.channels):
+            channel_id = _id("C", w, c)
+            members = rng.sample(workspace.user_ids, min(scale.channel_members, scale.members))
+            workspace.channels[channel_id] = members
+
+            channel_rows.append({"id": channel_id, "workspace_id": workspace.id, "name": f"bench-{c}"})
+            membership_rows.extend(
+                {
+                    "channel_id": channel_id,
+                    "user_id": user_id,
+                    "workspace_id": workspace.id,
+                    "role": "owner" if i == 0 else "member",
+                }
+                for i, user_id in enumerate(members)
+            )
+            message_rows.extend(
+                {
+                    "id": _id("M", w, c, m),
+                    "workspace_id": workspace.id,
+                    "channel_id": channel_id,
+                    "sender_id": rng.choice(members),
+                    "content": f"Bench message {m} in channel {c}",
+                    "created_at": now - timedelta(seconds=scale.messages - m),
+                }
+                for m in range(scale.messages)
+            )
+
+        await _insert(conn, Channel, channel_rows)
+        await _insert(conn, ChannelMembership, membership_rows)
+        await _insert(conn, Message, message_rows)
+        workspaces.append(workspace)
+
+    return workspaces
+
+
+async def seed_fresh(scale: Scale) -> list[SeededWorkspace]:
+    async with async_engine.connect() as conn:
+        async with conn.begin():
+            await reset(conn)
+            return await seed(conn, scale)
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser):
+    for name, value in asdict(Scale()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=value)
+
+
+def scale_from_args(args: argparse.Namespace) -> Scale:
+    return Scale(**{name: getattr(args, name) for name in asdict(Scale())})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_scale_arguments(parser)
+    scale = scale_from_args(parser.parse_args())
+    workspaces = asyncio.run(seed_fresh(scale))
+    print(f"Seeded {len(workspaces)} workspaces: {asdict(scale)}")
+
+
+if __name__ == "__main__":
+    main()
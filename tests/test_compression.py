@@ -0,0 +1,34 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.compression import _encoders
+
+zstandard = pytest.importorskip("zstandard")
+
+
+def test_zstd_compressor_is_never_shared_between_threads(monkeypatch):
+    compressors = []
+    real_compressor = zstandard.ZstdCompressor
+
+    class ThreadCheckedCompressor:
+        def __init__(self, **kwargs):
+            self.compressor = real_compressor(**kwargs)
+            self.thread_id = threading.get_ident()
+            compressors.append(self)
+
+        def compress(self, data):
+            assert threading.get_ident() == self.thread_id
+            return self.compressor.compress(data)
+
+    monkeypatch.setattr(zstandard, "ZstdCompressor", ThreadCheckedCompressor)
+    encode = _encoders(gzip_level=6, brotli_quality=5, zstd_level=3)["zstd"]
+    bodies = [bytes([i]) * (64 * 1024 + i) for i in range(32)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        compressed = list(pool.map(encode, bodies))
+
+    decompressor = zstandard.ZstdDecompressor()
+    assert [decompressor.decompress(body) for body in compressed] == bodies
+    assert 1 <= len(compressors) <= 4
@@ -0,0 +1,11 @@
+import socket
+
+from app.core.metrics import start_metrics_server
+
+
+def test_metrics_server_on_a_taken_port_does_not_fail_startup():
+    # A second uvicorn or ARQ worker finds the port bound by the first one
+    with socket.socket() as taken:
+        taken.bind(("", 0))
+        taken.listen()
+        start_metrics_server(taken.getsockname()[1])
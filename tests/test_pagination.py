@@ -0,0 +1,21 @@
+from enum import Enum
+
+import pytest
+
+from app.core.pagination import InvalidCursor, decode_member_cursor, encode_cursor
+
+
+class RoleEnum(str, Enum):
+    OWNER = "owner"
+    MEMBER = "member"
+
+
+def test_member_cursor_round_trips():
+    assert decode_member_cursor(encode_cursor("member", "U1"), RoleEnum) == ("member", "U1")
+    assert decode_member_cursor(None, RoleEnum) is None
+
+
+@pytest.mark.parametrize("cursor", [encode_cursor("superadmin", "U1"), encode_cursor("member"), "not base64!"])
+def test_tampered_member_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_member_cursor(cursor, RoleEnum)
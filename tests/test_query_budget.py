@@ -0,0 +1,87 @@
+"""Query budgets of the hot routes. Needs the docker-compose Postgres, migrated to head, and Redis.
+
+A budget failing with repeated statements is an N+1: batch the lookup rather than raise the budget.
+"""
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.main import fastapi_app
+from app.modules.auth.utils import generate_token
+from benchmarks.seed import Scale, reset, seed_fresh
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+# Enough messages to fill a page, the budgets hold for any page size
+SCALE = Scale(members=10, channels=3, channel_members=5, messages=60)
+PAGE_SIZE = 50
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def workspace():
+    try:
+        workspaces = await seed_fresh(SCALE)
+    except (OSError, DBAPIError) as e:
+        pytest.skip(f"Postgres is not reachable: {e}")
+    yield workspaces[0]
+    async with async_engine.begin() as conn:
+        await reset(conn)
+    await async_engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def channel_id(workspace):
+    return next(iter(workspace.channels))
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client(workspace, channel_id):
+    access_token, _ = generate_token(
+        "access_token",
+        secret_key=settings.ACCESS_SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+        expires_minutes=10,
+        user_id=workspace.channels[channel_id][0],
+    )
+    async with fastapi_app.router.lifespan_context(fastapi_app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=fastapi_app),
+            base_url=f"http://test{settings.API_V1_STR}/workspaces",
+            cookies={"access_token": access_token},
+        ) as client:
+            yield client
+
+
+async def test_get_workspace(client, workspace, max_queries):
+    # user, membership, workspace, its own membership, first member page and count
+    with max_queries(6, max_repeats=2):
+        response = await client.get(f"/{workspace.id}")
+    assert response.status_code == 200
+
+
+async def test_get_channels(client, workspace, max_queries):
+    with max_queries(5, max_repeats=1):
+        response = await client.get(f"/{workspace.id}/channels")
+    assert response.status_code == 200
+    assert response.json()["data"]
+
+
+async def test_get_messages_by_channel(client, workspace, channel_id, max_queries):
+    # Reactions, mentions and senders are loaded for the whole page at once
+    with max_queries(7, max_repeats=1):
+        response = await client.get(f"/{workspace.id}/channels/{channel_id}/messages", params={"limit": PAGE_SIZE})
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == PAGE_SIZE
+
+
+async def test_create_message(client, workspace, channel_id, max_queries):
+    # Unread counts of every offline member are bumped in one statement
+    with max_queries(10, max_repeats=2):
+        response = await client.post(
+            f"/{workspace.id}/channels/{channel_id}/messages", json={"content": "within budget"}
+        )
+    assert response.status_code == 201
@@ -0,0 +1,158 @@
+import asyncio
+
+import fakeredis
+import pytest
+import socketio
+
+from app.modules.notifications.realtime.sharded_manager import ShardedAsyncRedisManager
+
+NAMESPACE = "/"
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    """One in-memory Redis shared by every manager created in the test, standing in for the real backend."""
+    server = fakeredis.FakeServer()
+
+    def _redis_connect(self):
+        self.redis = fakeredis.FakeAsyncRedis(server=server)
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self.connected = True
+
+    monkeypatch.setattr(ShardedAsyncRedisManager, "_redis_connect", _redis_connect)
+    return server
+
+
+class Node:
+    """A Socket.IO server with the sharded manager, recording the packets it sends to its local sockets."""
+
+    def __init__(self, serializer: str = "json", shards: int = 8, write_only: bool = False):
+        self.manager = ShardedAsyncRedisManager(
+            "redis://fake", shards=shards, serializer=serializer, write_only=write_only
+        )
+        self.server = socketio.AsyncServer(
+            async_mode="asgi",
+            client_manager=self.manager,
+            serializer="msgpack" if serializer == "msgpack" else "default",
+        )
+        self.received = []
+        self.delivered = asyncio.Event()
+
+        async def send_eio_packet(eio_sid, eio_packet):
+            self.received.append((eio_sid, eio_packet.data))
+            self.delivered.set()
+
+        self.server._send_eio_packet = send_eio_packet
+
+    async def start(self):
+        self.manager.initialize()
+        # Let the listener connect and subscribe to the base channel
+        await asyncio.sleep(0.05)
+
+    async def join(self, eio_sid: str, room: str):
+        sid = await self.manager.connect(eio_sid, NAMESPACE)
+        self.manager.basic_enter_room(sid, NAMESPACE, room)
+        return sid
+
+    async def wait_delivery(self, timeout: float = 1):
+        await asyncio.wait_for(self.delivered.wait(), timeout)
+
+    async def stop(self):
+        self.manager.thread.cancel()
+        await asyncio.gather(self.manager.thread, return_exceptions=True)
+
+
+@pytest.fixture
+async def nodes(redis_server):
+    started = []
+
+    async def make(**kwargs) -> Node:
+        node = Node(**kwargs)
+        if not node.manager.write_only:
+            await node.start()
+            started.append(node)
+        return node
+
+    yield make
+    for node in started:
+        await node.stop()
+
+
+async def test_room_emit_reaches_other_node(nodes):
+    sender = await nodes()
+    receiver = await nodes()
+    await receiver.join("eio-1", "channel_abc")
+    await asyncio.sleep(0.05)  # shard subscription
+
+    await sender.manager.emit("message:create", {"id": "m1"}, namespace=NAMESPACE, room="channel_abc")
+
+    await receiver.wait_delivery()
+    assert receiver.received == [("eio-1", '2["message:create",{"id":"m1"}]')]
+    assert sender.received == []
+
+
+async def test_write_only_publisher_connects_lazily(nodes):
+    # ARQ workers only publish: the first emit has to open the connection itself
+    publisher = await nodes(write_only=True)
+    receiver = await nodes()
+    await receiver.join("eio-1", "user_42")
+    await asyncio.sleep(0.05)
+
+    assert publisher.manager.redis is None
+    await publisher.manager.emit("notification", {"n": 1}, namespace=NAMESPACE, room="user_42")
+
+    await receiver.wait_delivery()
+    assert receiver.received == [("eio-1", '2["notification",{"n":1}]')]
+
+
+async def test_node_only_subscribes_to_shards_of_local_rooms(nodes):
+    receiver = await nodes(shards=64)
+    await receiver.join("eio-1", "channel_abc")
+    await asyncio.sleep(0.05)
+
+    shard = receiver.manager._shard_of("channel_abc")
+    assert receiver.manager._subscribed_shards == {shard}
+
+
+async def test_list_emit_is_split_per_shard(nodes):
+    sender = await nodes()
+    first = await nodes()
+    second = await nodes()
+    rooms = [f"user_{i}" for i in range(20)]
+    await first.join("eio-1", rooms[0])
+    await second.join("eio-2", rooms[-1])
+    await asyncio.sleep(0.05)
+
+    await sender.manager.emit("unread", {"count": 1}, namespace=NAMESPACE, room=rooms)
+
+    await asyncio.gather(first.wait_delivery(), second.wait_delivery())
+    assert first.received == [("eio-1", '2["unread",{"count":1}]')]
+    assert second.received == [("eio-2", '2["unread",{"count":1}]')]
+
+
+@pytest.mark.parametrize(("sender_serializer", "receiver_serializer"), [("json", "msgpack"), ("msgpack", "json")])
+async def test_mixed_serializers_understand_each_other(nodes, sender_serializer, receiver_serializer):
+    # During a rolling switch of SOCKET_IO_SERIALIZER both formats are on the channels at once
+    sender = await nodes(serializer=sender_serializer)
+    receiver = await nodes(serializer=receiver_serializer)
+    await receiver.join("eio-1", "channel_abc")
+    await asyncio.sleep(0.05)
+
+    await sender.manager.emit(
+        "message:create", {"id": "m1", "tags": ["a"]}, namespace=NAMESPACE, room=["channel_abc", "user_1"]
+    )
+
+    await receiver.wait_delivery()
+    [(eio_sid, packet)] = receiver.received
+    assert eio_sid == "eio-1"
+    decoded = receiver.server.packet_class(encoded_packet=packet)
+    assert decoded.data == ["message:create", {"id": "m1", "tags": ["a"]}]
+
+
+def test_msgpack_frames_without_msgpack_are_dropped(redis_server):
+    manager = ShardedAsyncRedisManager("redis://fake", serializer="msgpack")
+    frame = manager._encode({"method": "emit", "data": [1]}, {"socketio": "user_1"})["socketio"]
+
+    manager._msgpack = None
+    assert manager._decode(frame) is None
+    assert manager._decode(b'{"method": "emit", "data": [1]}') == {"method": "emit", "data": [1]}